@@ -1,6 +1,52 @@
-from .sbl import entry as sbl_entry
-from .scard import entry as scard_entry
-from .sbench import entry as sbench_entry
-from .svalid import entry as svalid_entry
-from .sboard import entry as sboard_entry
-from .swrite import entry as swrite_entry
+"""Entry points of the console scripts.
+
+Each only imports the modules its command needs, when it's run.
+"""
+
+
+def sbl_entry():
+    from scrummd.sbl import entry
+
+    return entry()
+
+
+def scard_entry():
+    from scrummd.scard import entry
+
+    return entry()
+
+
+def sbench_entry():
+    from scrummd.sbench import entry
+
+    return entry()
+
+
+def svalid_entry():
+    from scrummd.svalid import entry
+
+    return entry()
+
+
+def sboard_entry():
+    from scrummd.sboard import entry
+
+    return entry()
+
+
+def swrite_entry():
+    from scrummd.swrite import entry
+
+    return entry()
+
+
+def sexport_entry():
+    from scrummd.sexport import entry
+
+    return entry()
+
+
+def sdaemon_entry():
+    from scrummd.sdaemon import entry
+
+    return entry()
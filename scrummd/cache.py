@@ -0,0 +1,259 @@
+"""Persistent cache of parsed cards, kept in a folder for the scrum path in the user's cache folder.
+
+The cache is pickled, and unpickling runs whatever the file says to - so it's never kept in the
+scrum path, where it could be committed (or otherwise supplied) by someone else.
+"""
+
+import hashlib
+import logging
+import os
+import pathlib
+import pickle
+import sys
+import tempfile
+from typing import TYPE_CHECKING, Any, Optional
+
+from scrummd import const
+from scrummd.config import ScrumConfig
+from scrummd.version import version
+
+if TYPE_CHECKING:
+    from scrummd.card import Card
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT = 3
+"""Bumped whenever the layout of the cache file, or of what's pickled into it, changes"""
+
+CacheKey = tuple[int, int]
+"""The (mtime_ns, size) of the file a cached card was read from"""
+
+
+def _user_cache_home() -> pathlib.Path:
+    """The platform's folder for the user's caches"""
+    if sys.platform == "win32":
+        local_app_data = os.environ.get("LOCALAPPDATA")
+        if local_app_data:
+            return pathlib.Path(local_app_data)
+        return pathlib.Path.home() / "AppData" / "Local"
+    if sys.platform == "darwin":
+        return pathlib.Path.home() / "Library" / "Caches"
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+    if xdg_cache_home:
+        return pathlib.Path(xdg_cache_home)
+    return pathlib.Path.home() / ".cache"
+
+
+def cache_folder(config: ScrumConfig) -> pathlib.Path:
+    """Folder that caches are stored in for this configuration
+
+    Args:
+        config (ScrumConfig): ScrumMD configuration
+
+    Returns:
+        pathlib.Path: Path of the folder for the scrum path in the user's cache folder (such as
+            ``~/.cache/scrummd/<hash of the scrum path>``)
+    """
+    scrum_path = str(pathlib.Path(config.scrum_path).resolve())
+    key = hashlib.sha256(scrum_path.encode()).hexdigest()[:16]
+    return _user_cache_home() / const.CACHE_FOLDER_NAME / key
+
+
+def config_hash(config: ScrumConfig) -> str:
+    """Hash of the parts of the configuration that change how a card is parsed
+
+    A card parsed with one configuration can only be reused with another configuration if this
+    hash matches.
+
+    Args:
+        config (ScrumConfig): ScrumMD configuration
+
+    Returns:
+        str: Hex digest of the relevant configuration
+    """
+    relevant = (
+        CACHE_FORMAT,
+        version,
+        config.scrum_path,
+        config.allow_header_summary,
+        config.fields,
+        config.required,
+        # Collection rules decide which fields a lazily parsed card can defer
+        config.collections,
+    )
+    return hashlib.sha256(repr(relevant).encode()).hexdigest()
+
+
+def file_key(stat: os.stat_result) -> CacheKey:
+    """Key for a file from its stat
+
+    Args:
+        stat (os.stat_result): Result of os.stat for the file
+
+    Returns:
+        CacheKey: Key to compare cache entries with
+    """
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class ParseCache:
+    """Cards that have already been parsed, keyed by their path and the state of their file"""
+
+    def __init__(
+        self,
+        config: ScrumConfig,
+        path: Optional[pathlib.Path],
+        entries: Optional[dict[str, tuple[CacheKey, "Card"]]] = None,
+    ) -> None:
+        """
+        Constructor for ParseCache.
+
+        Args:
+            config (ScrumConfig): Configuration the cards are parsed with.
+            path (Optional[pathlib.Path]): File the cache is saved to. None to keep it in memory.
+            entries (Optional[dict]): Already cached cards.
+        """
+        self._config = config
+        self._config_hash = config_hash(config)
+        self._path = path
+        self._entries: dict[str, tuple[CacheKey, "Card"]] = entries or {}
+        self._seen: set[str] = set()
+        self._dirty = False
+
+    @property
+    def config_hash(self) -> str:
+        """Hash of the config the cached cards were parsed with"""
+        return self._config_hash
+
+    def get(self, path: str, key: CacheKey) -> Optional["Card"]:
+        """Get a card if it's cached, and its file hasn't changed since
+
+        Args:
+            path (str): Path of the card file
+            key (CacheKey): Current key of the card file
+
+        Returns:
+            Optional[Card]: The cached card, or None if it needs to be parsed
+        """
+        self._seen.add(path)
+        entry = self._entries.get(path)
+        if entry is None or entry[0] != key:
+            return None
+        card = entry[1]
+        # Cards share the live config rather than the unpickled copy of it
+        card._config = self._config
+        return card
+
+    def put(self, path: str, key: CacheKey, card: "Card") -> None:
+        """Store a freshly parsed card
+
+        Args:
+            path (str): Path of the card file
+            key (CacheKey): Key of the card file when it was read
+            card (Card): The parsed card
+        """
+        self._seen.add(path)
+        self._entries[path] = (key, card)
+        self._dirty = True
+
+    def discard(self, path: str) -> None:
+        """Remove a card from the cache (for instance, because it no longer parses)
+
+        Args:
+            path (str): Path of the card file
+        """
+        if self._entries.pop(path, None) is not None:
+            self._dirty = True
+
+    def prune(self) -> None:
+        """Forget every cached card whose file wasn't looked up since the cache was opened"""
+        removed = set(self._entries) - self._seen
+        for path in removed:
+            del self._entries[path]
+        self._dirty = self._dirty or bool(removed)
+        self._seen = set()
+
+    def save(self) -> None:
+        """Write the cache to disk, if it's changed and isn't in memory only"""
+        if self._path is None or not self._dirty:
+            return
+
+        contents: dict[str, Any] = {
+            "config_hash": self._config_hash,
+            "entries": self._entries,
+        }
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            # A uniquely named file, so concurrent runs don't write over each other's
+            temp_fd, temp_path = tempfile.mkstemp(
+                dir=self._path.parent, prefix=self._path.name, suffix=".tmp"
+            )
+            try:
+                with os.fdopen(temp_fd, "wb") as cache_file:
+                    pickle.dump(contents, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+                # Replace rather than write in place, so a concurrent run never reads half a cache
+                os.replace(temp_path, self._path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+            self._dirty = False
+        except OSError as ex:
+            logger.warning("Unable to write cache %s (%s)", self._path, ex)
+
+
+_pinned: dict[str, ParseCache] = {}
+"""Caches kept in memory for the life of the process, by the hash of their config"""
+
+
+def pin_cache(config: ScrumConfig) -> ParseCache:
+    """Keep an in-memory cache for the configuration for the life of the process
+
+    Every subsequent open_cache with an equivalent configuration returns the same cache, whether
+    or not caching is enabled in the configuration. Used by long-running processes like the
+    daemon.
+
+    Args:
+        config (ScrumConfig): ScrumMD configuration
+
+    Returns:
+        ParseCache: The pinned cache
+    """
+    key = config_hash(config)
+    if key not in _pinned:
+        _pinned[key] = ParseCache(config, None)
+    return _pinned[key]
+
+
+def open_cache(config: ScrumConfig) -> Optional[ParseCache]:
+    """Open the parse cache for the configuration
+
+    Args:
+        config (ScrumConfig): ScrumMD configuration
+
+    Returns:
+        Optional[ParseCache]: The cache, or None if caching isn't enabled in the config
+    """
+    pinned = _pinned.get(config_hash(config))
+    if pinned is not None:
+        return pinned
+
+    if not config.cache:
+        return None
+
+    path = cache_folder(config) / const.PARSE_CACHE_FILE_NAME
+    expected_hash = config_hash(config)
+    try:
+        with open(path, "rb") as cache_file:
+            contents = pickle.load(cache_file)
+    except FileNotFoundError:
+        return ParseCache(config, path)
+    except Exception as ex:
+        # A corrupt or incompatible cache just means starting over
+        logger.warning("Ignoring unreadable cache %s (%s)", path, ex)
+        return ParseCache(config, path)
+
+    if not isinstance(contents, dict) or contents.get("config_hash") != expected_hash:
+        logger.info("Configuration changed; discarding cache %s", path)
+        return ParseCache(config, path)
+
+    return ParseCache(config, path, contents["entries"])
@@ -16,7 +16,7 @@ from scrummd.source_md import (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class Card:
     """A Scrum 'Card' - might be a chunk of work, might be an epic, might be a ticket."""
 
@@ -57,6 +57,8 @@ class Card:
             Optional[Field]: Field from Card, UDF if not present, or None if in neither.
         """
         if field_name not in NON_UDF_FIELDS:
+            if field_name not in self.udf and self.parsed_md.is_lazy:
+                self.resolve()
             return self.udf.get(field_name)
 
         match field_name:
@@ -69,6 +71,19 @@ class Card:
             case _:
                 raise NotImplementedError(f"{field_name} not yet available for output")
 
+    def resolve(self) -> None:
+        """Extract any fields that were deferred by lazily loading the card
+
+        Lazily loaded cards (see source_md.extract_fields) only have the fields from their leading
+        property block until this is called. get_field calls it when a field isn't found.
+        """
+        if not self.parsed_md.is_lazy:
+            return
+        self.parsed_md.resolve(self._config)
+        self.udf.update(
+            {k: v for k, v in self.parsed_md.items() if k not in NON_UDF_FIELDS}
+        )
+
     def assert_valid_rules(self, config: CollectionConfig) -> None:
         """Raise an error if a card doesn't comply with an active configuration
 
@@ -86,6 +101,14 @@ class Card:
                 value per the collections `fields` config.
         """
 
+        # A lazily loaded card may have deferred a field the rules are about
+        deferred_keys = self.parsed_md.deferred_keys
+        if deferred_keys and any(
+            key.casefold() in deferred_keys
+            for key in [*config.fields, *config.required]
+        ):
+            self.resolve()
+
         for key, value in self.udf.items():
             if key in config.fields:
                 if isinstance(value, str) and value.lower() not in [
@@ -225,6 +248,7 @@ def from_str(
     input_card: str,
     collection_from_path: str,
     path: Path,
+    lazy: bool = False,
 ) -> Card:
     """Create a card from a string (usually, the file)
 
@@ -233,6 +257,8 @@ def from_str(
         input_card (str): String containing the card data from the file.
         collection_from_path (str): Collection the card is known to be from the relative path.
         path (Path): Path of the file
+        lazy (bool, optional): Only extract the fields that can't be deferred - see
+            source_md.extract_fields. Defaults to False.
 
     Raises:
         InvalidFileError: Error with the MD file
@@ -244,5 +270,5 @@ def from_str(
     Returns:
         Card: The card for the md file
     """
-    parsed_md: ParsedMd = extract_fields(config, input_card)
+    parsed_md: ParsedMd = extract_fields(config, input_card, lazy)
     return from_parsed(config, parsed_md, collection_from_path, path)
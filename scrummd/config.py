@@ -4,6 +4,9 @@ from dataclasses import dataclass, field, fields
 from typing import Optional
 from scrummd import const
 
+IO_MODES = ("read", "mmap")
+"""Ways card files can be read - see ScrumConfig.io_mode"""
+
 
 @dataclass
 class CollectionConfig:
@@ -70,6 +73,20 @@ class ScrumConfig(CollectionConfig):
 
     allow_header_summary: bool = False
 
+    cache: bool = False
+    """Cache parsed cards in the user's cache folder between runs (see scrummd.cache.cache_folder)"""
+
+    workers: int = 1
+    """Worker processes to parse cards with. 1 parses in the running process; 0 uses one per CPU."""
+
+    prefetch: int = 0
+    """Card files to read ahead in background threads while parsing. 0 reads each file as it's
+    parsed."""
+
+    io_mode: str = "read"
+    """How card files are read (one of IO_MODES). "read" reads and decodes each file whole; "mmap" maps each file
+    into memory, and only decodes the parts that are parsed (see source_md.extract_mapped_fields)"""
+
     def __post_init__(self):
         """Fix up embedded fields, which default to dicts"""
 
@@ -85,3 +102,12 @@ class ScrumConfig(CollectionConfig):
             self.scard = ScardConfig(**self.scard)
         if isinstance(self.sboard, dict):
             self.sboard = SboardConfig(**self.sboard)
+
+        if self.workers < 0:
+            raise ValueError(f"workers is {self.workers}, but can't be negative")
+        if self.prefetch < 0:
+            raise ValueError(f"prefetch is {self.prefetch}, but can't be negative")
+        if self.io_mode not in IO_MODES:
+            raise ValueError(
+                f'io_mode is "{self.io_mode}", but has to be one of {", ".join(IO_MODES)}'
+            )
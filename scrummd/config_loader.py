@@ -1,5 +1,6 @@
 """Code for loading the config from the filesystem"""
 
+import argparse
 import sys
 import os
 from scrummd import const
@@ -27,3 +28,48 @@ def load_fs_config() -> ScrumConfig:
                 return ScrumConfig(**relevant_settings)
 
     return ScrumConfig()
+
+
+def non_negative_int(argument: str) -> int:
+    """Transform an argument that's an amount (such as --jobs or --limit) into an int
+
+    Args:
+        argument (str): The argument
+
+    Returns:
+        int: The amount
+    """
+    try:
+        amount = int(argument)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{argument} is not a whole number")
+    if amount < 0:
+        raise argparse.ArgumentTypeError(f"{argument} is negative")
+    return amount
+
+
+def add_jobs_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the --jobs argument, which overrides the ``workers`` configuration
+
+    Args:
+        parser (argparse.ArgumentParser): Parser to add the argument to
+    """
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=non_negative_int,
+        metavar="N",
+        help="Amount of worker processes to parse cards with. 0 uses one per CPU. "
+        + "Overrides the workers configuration.",
+    )
+
+
+def apply_arguments(config: ScrumConfig, args: argparse.Namespace) -> None:
+    """Apply any configuration overridden by command line arguments
+
+    Args:
+        config (ScrumConfig): Configuration to modify
+        args (argparse.Namespace): Parsed arguments
+    """
+    if getattr(args, "jobs", None) is not None:
+        config.workers = args.jobs
@@ -1,3 +1,6 @@
 DEFAULT_SCRUM_FOLDER_NAME = "scrum"
 CONFIG_FILE_NAME = [".scrum.toml", "scrum.toml", "pyproject.toml"]
 DEFAULT_SCARD_TEMPLATE = "default_scard.j2"
+CACHE_FOLDER_NAME = "scrummd"
+PARSE_CACHE_FILE_NAME = "parse_cache.pickle"
+TEMPLATE_CACHE_FOLDER_NAME = "templates"
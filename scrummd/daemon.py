@@ -0,0 +1,359 @@
+"""A local server that keeps cards loaded between runs of ScrumMD commands.
+
+The server listens on a Unix domain socket in the cache folder of the scrum path. Commands
+that support it (``sbl``, ``scard`` and ``sboard``) send it their arguments and their stdin,
+stdout and stderr file descriptors, and the server runs the command against those - so the output
+is exactly the same as running the command without the server. If the server isn't running, the
+commands load the cards themselves as usual.
+
+The server keeps every card loaded in a CollectionIndex, which the commands use in place of
+loading the cards (see collection.serve_index). Before each command, the card files are listed
+and the index is updated with those whose modification time or size has changed.
+"""
+
+import json
+import logging
+import os
+import pathlib
+import socket
+import sys
+import traceback
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from scrummd.cache import CacheKey, cache_folder, file_key, pin_cache
+from scrummd.config import ScrumConfig
+from scrummd.config_loader import load_fs_config
+
+if TYPE_CHECKING:
+    from scrummd.collection import CollectionIndex
+
+logger = logging.getLogger(__name__)
+
+SOCKET_FILE_NAME = "daemon.sock"
+
+MAX_REQUEST_SIZE = 16 * 1024 * 1024
+"""Largest request (mostly, arguments) that the server accepts"""
+
+_MARKER = b"\0"
+"""Sent ahead of each request, carrying any file descriptors"""
+
+_serving = False
+"""True in the server process, so commands run by the server don't try to use the server"""
+
+
+def socket_path(config: ScrumConfig) -> pathlib.Path:
+    """Path of the socket for the scrum folder in the configuration
+
+    Args:
+        config (ScrumConfig): ScrumMD configuration
+
+    Returns:
+        pathlib.Path: Path of the socket file
+    """
+    return cache_folder(config) / SOCKET_FILE_NAME
+
+
+def is_supported() -> bool:
+    """Whether the platform supports the server (it needs Unix domain sockets)
+
+    Returns:
+        bool: True if supported
+    """
+    return hasattr(socket, "AF_UNIX") and hasattr(socket, "send_fds")
+
+
+def _send_message(connection: socket.socket, message: dict[str, Any]) -> None:
+    """Send a newline terminated JSON message"""
+    connection.sendall(json.dumps(message).encode() + b"\n")
+
+
+def _receive_message(connection: socket.socket) -> dict[str, Any]:
+    """Receive a newline terminated JSON message"""
+    received = bytearray()
+    while not received.endswith(b"\n"):
+        if len(received) > MAX_REQUEST_SIZE:
+            raise ValueError("Request too large")
+        chunk = connection.recv(65536)
+        if not chunk:
+            raise ConnectionError("Connection closed mid-message")
+        received += chunk
+    return json.loads(received)
+
+
+def _connect(config: ScrumConfig) -> Optional[socket.socket]:
+    """Connect to the server for the configuration, if it's running"""
+    if not is_supported():
+        return None
+    path = socket_path(config)
+    if not path.exists():
+        return None
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(str(path))
+    except OSError:
+        # Left over from a server that didn't clean up after itself
+        connection.close()
+        return None
+    return connection
+
+
+def request(config: ScrumConfig, message: dict[str, Any]) -> Optional[dict[str, Any]]:
+    """Send a request to the server, without any file descriptors
+
+    Args:
+        config (ScrumConfig): ScrumMD configuration
+        message (dict[str, Any]): Request to send
+
+    Returns:
+        Optional[dict[str, Any]]: The response, or None if the server isn't running
+    """
+    connection = _connect(config)
+    if connection is None:
+        return None
+    with connection:
+        socket.send_fds(connection, [_MARKER], [])
+        _send_message(connection, message)
+        return _receive_message(connection)
+
+
+def try_remote(command: str) -> Optional[int]:
+    """Run the command (with the arguments in ``sys.argv``) with the server, if it's running
+
+    Args:
+        command (str): Name of the command
+
+    Returns:
+        Optional[int]: Exit code of the command, or None if it needs to be run in this process
+    """
+    if _serving or not is_supported():
+        return None
+
+    config = load_fs_config()
+    connection = _connect(config)
+    if connection is None:
+        return None
+
+    with connection:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            # The descriptors are sent with a marker byte ahead of the request, so they're
+            # received before the rest of the (arbitrarily long) request is read.
+            socket.send_fds(
+                connection,
+                [_MARKER],
+                [sys.stdin.fileno(), sys.stdout.fileno(), sys.stderr.fileno()],
+            )
+            _send_message(
+                connection,
+                {"command": command, "argv": sys.argv, "cwd": os.getcwd()},
+            )
+            response = _receive_message(connection)
+        except (OSError, ValueError) as ex:
+            logger.debug("Daemon request failed (%s); running locally", ex)
+            return None
+
+    if response.get("status") != "ok":
+        return None
+    return response.get("exit_code", 0)
+
+
+def _entry_points() -> dict[str, Callable[[], Optional[int]]]:
+    """Entry points of the commands the server runs"""
+    from scrummd import sbl, scard, sboard
+
+    return {
+        "sbl": sbl.entry,
+        "scard": scard.entry,
+        "sboard": sboard.entry,
+    }
+
+
+class _ProblemsLogged(logging.Handler):
+    """Notes whether any warnings or errors are logged while it's attached"""
+
+    def __init__(self) -> None:
+        super().__init__(logging.WARNING)
+        self.logged = False
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.logged = True
+
+
+def _scan(config: ScrumConfig) -> dict[str, CacheKey]:
+    """Key (modification time and size) of every card file, by path, in the order they're loaded"""
+    # Imported here, as the commands import this module before they know they need to load cards
+    from scrummd.loader import card_paths
+
+    files: dict[str, CacheKey] = {}
+    for path, _ in card_paths(config):
+        try:
+            files[str(path)] = file_key(os.stat(path))
+        except OSError:
+            # Gone since it was listed
+            continue
+    return files
+
+
+class Server:
+    """Server that keeps the cards loaded, and runs commands for clients"""
+
+    def __init__(self, config: ScrumConfig) -> None:
+        """
+        Constructor for Server.
+
+        Args:
+            config (ScrumConfig): Configuration of the scrum folder being served.
+        """
+        self._config = config
+        self._cwd = os.path.realpath(os.getcwd())
+        self._entry_points = _entry_points()
+        self._running = False
+        self._index: Optional["CollectionIndex"] = None
+        self._files: dict[str, CacheKey] = {}
+
+    def warm(self) -> None:
+        """Load every card into memory"""
+        pin_cache(self._config)
+        self.refresh()
+
+    def _updated(
+        self, collection_index: "CollectionIndex", files: dict[str, CacheKey]
+    ) -> Optional["CollectionIndex"]:
+        """The index updated for the files that have changed, or None if it has to be loaded again
+        to have the cards in the order they'd be loaded in"""
+        if files.keys() - self._files.keys():
+            # Added cards go at the end of the index, rather than where they'd be loaded
+            return None
+        changed = [path for path, key in files.items() if key != self._files[path]]
+        removed = self._files.keys() - files.keys()
+        if not changed and not removed:
+            return collection_index
+
+        indexes = [collection_index.paths.get(path) for path in changed]
+        collection_index.update(changed=changed, removed=removed)
+        if indexes != [collection_index.paths.get(path) for path in changed]:
+            # A card whose index changes goes to the end of the index, too
+            return None
+        return collection_index
+
+    def refresh(self) -> None:
+        """Bring the loaded cards up to date with the card files
+
+        The files are listed, and only those whose modification time or size has changed are read
+        again. If there's any problem loading the cards (which the commands would report), the
+        index isn't served - the commands then load the cards themselves, and report it as usual.
+        """
+        # Imported here to avoid a circular import; collection doesn't depend on the daemon, but
+        # the commands it runs do.
+        from scrummd.collection import load_collection_index, serve_index
+
+        serve_index(None)
+        files = _scan(self._config)
+        problems = _ProblemsLogged()
+        root_logger = logging.getLogger()
+        root_logger.addHandler(problems)
+        try:
+            collection_index = None
+            if self._index is not None:
+                collection_index = self._updated(self._index, files)
+            if collection_index is None:
+                collection_index = load_collection_index(self._config)
+        except Exception as ex:
+            logger.info("Not serving the cards, as they failed to load (%s)", ex)
+            collection_index = None
+        finally:
+            root_logger.removeHandler(problems)
+
+        if problems.logged:
+            # The problems are only logged when the cards change, but the commands would log
+            # them every time
+            collection_index = None
+        self._index = collection_index
+        self._files = files if collection_index is not None else {}
+        serve_index(collection_index)
+
+    def _run(self, command: str, argv: list[str], fds: list[int]) -> int:
+        """Run a command with the client's stdin, stdout and stderr"""
+        entry = self._entry_points[command]
+        sys.stdout.flush()
+        sys.stderr.flush()
+        saved_fds = [os.dup(fd) for fd in range(3)]
+        saved_argv = sys.argv
+        try:
+            for target_fd, client_fd in enumerate(fds):
+                os.dup2(client_fd, target_fd)
+            sys.argv = argv
+            try:
+                exit_code = entry()
+            except SystemExit as ex:
+                # argparse exits for --help, --version and invalid arguments
+                exit_code = ex.code if isinstance(ex.code, int) else int(bool(ex.code))
+            except Exception as ex:
+                # Reported like an uncaught exception would be, minus the server's own frame
+                assert ex.__traceback__ is not None
+                traceback.print_exception(type(ex), ex, ex.__traceback__.tb_next)
+                exit_code = 1
+            return exit_code or 0
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            sys.argv = saved_argv
+            for target_fd, saved_fd in enumerate(saved_fds):
+                os.dup2(saved_fd, target_fd)
+                os.close(saved_fd)
+
+    def _handle(self, connection: socket.socket) -> None:
+        """Handle a single client connection"""
+        _, fds, _, _ = socket.recv_fds(connection, len(_MARKER), 3)
+        try:
+            message = _receive_message(connection)
+            command = message.get("command")
+            if command == "status":
+                _send_message(connection, {"status": "ok", "cwd": self._cwd})
+            elif command == "stop":
+                self._running = False
+                _send_message(connection, {"status": "ok"})
+            elif (
+                command in self._entry_points
+                and len(fds) == 3
+                and os.path.realpath(message.get("cwd", "")) == self._cwd
+            ):
+                self.refresh()
+                exit_code = self._run(command, message.get("argv", [command]), fds)
+                _send_message(connection, {"status": "ok", "exit_code": exit_code})
+            else:
+                # The client should run the command itself
+                _send_message(connection, {"status": "fallback"})
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+    def serve(self) -> None:
+        """Serve clients until asked to stop"""
+        global _serving
+        _serving = True
+
+        path = socket_path(self._config)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            if request(self._config, {"command": "status"}) is not None:
+                raise RuntimeError(f"A daemon is already listening on {path}")
+            path.unlink()
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(str(path))
+            os.chmod(path, 0o600)
+            server.listen()
+            self._running = True
+            try:
+                while self._running:
+                    connection, _ = server.accept()
+                    with connection:
+                        try:
+                            self._handle(connection)
+                        except (OSError, ValueError) as ex:
+                            logger.warning("Failed handling request (%s)", ex)
+            finally:
+                path.unlink(missing_ok=True)
+                _serving = False
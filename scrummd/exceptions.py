@@ -46,6 +46,18 @@ class RequiredFieldNotPresentError(RuleViolationError):
     pass
 
 
+class ChangeDetectionError(Exception):
+    """Raised when the files changed in git can't be found"""
+
+    pass
+
+
+class InvalidSnapshotError(ValueError):
+    """Raised when a file can't be read as a snapshot"""
+
+    pass
+
+
 class TemplateNotFoundError(FileNotFoundError):
     """Raised when a template file can't be found."""
 
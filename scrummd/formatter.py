@@ -2,10 +2,9 @@
 
 import pathlib
 import sys
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Callable, Optional, Any
-from importlib import resources
-import jinja2
 import logging
 
 from scrummd.source_md import (
@@ -19,16 +18,25 @@ from scrummd.source_md import (
 )
 
 import scrummd.config
+from scrummd import const
+from scrummd.cache import cache_folder
+from scrummd.collection import build_backlinks
 from scrummd.exceptions import TemplateNotFoundError
+from scrummd.loader import worker_count
 
 
 if TYPE_CHECKING:
+    import jinja2
+    import jinja2.runtime
     from scrummd.card import Card
     from scrummd.scard import Collection
 
-env = jinja2.Environment()
+_env: Optional["jinja2.Environment"] = None
+"""The environment templates are compiled in. Made when first needed - see environment"""
 
-_compiled_templates: dict[str, jinja2.Template] = {}
+_compiled_templates: dict[str, tuple[int, "jinja2.Template"]] = {}
+"""Compiled templates by the resolved path of their file, with the mtime of the file when it was
+compiled"""
 
 LOGGER = logging.getLogger(__name__)
 
@@ -36,8 +44,34 @@ LOGGER = logging.getLogger(__name__)
 DEFAULT_MD_TEMPLATE = "default_md.j2"
 """The default MD template"""
 
+PARALLEL_RENDER_THRESHOLD = 64
+"""Fewest cards to render before it's worth starting worker processes"""
 
-def load_template(filename: str, config: scrummd.config.ScrumConfig) -> jinja2.Template:
+MAX_RENDER_CHUNK_SIZE = 16
+"""Most cards to send to a worker process to render at once"""
+
+
+def environment() -> "jinja2.Environment":
+    """The jinja2 environment that templates are compiled in
+
+    jinja2 is only imported when this is first called, so commands that don't render templates
+    don't pay for importing it.
+
+    Returns:
+        jinja2.Environment: The environment
+    """
+    global _env
+    if _env is None:
+        import jinja2
+
+        _env = jinja2.Environment()
+        _env.filters["apply_field_macros"] = jinja2.pass_context(_apply_field_macros)
+    return _env
+
+
+def load_template(
+    filename: str, config: scrummd.config.ScrumConfig
+) -> "jinja2.Template":
     """Load the template (using path rules) from the filename.
 
     Tries to find the file in the following order:
@@ -46,6 +80,10 @@ def load_template(filename: str, config: scrummd.config.ScrumConfig) -> jinja2.T
         3. The file in the ``templates`` directory in the ``scrum_path``
         4. The module resources
 
+    Compiled templates are kept for the life of the process (and compiled again if their file
+    changes). If caching is enabled in the config, the compiled code is also cached in the
+    cache folder of the ``scrum_path`` (see scrummd.cache.cache_folder) between runs.
+
     Args:
         filename (str): Filename of template to load
         config (scrummd.config.ScrumConfig): Scrum Config
@@ -54,9 +92,6 @@ def load_template(filename: str, config: scrummd.config.ScrumConfig) -> jinja2.T
         jinja2.Template: Compiled Jinja2 Template
     """
 
-    if filename in _compiled_templates:
-        return _compiled_templates[filename]
-
     scrum_path = pathlib.Path(config.scrum_path)
     paths: list[pathlib.Path] = [
         pathlib.Path(filename),
@@ -64,23 +99,75 @@ def load_template(filename: str, config: scrummd.config.ScrumConfig) -> jinja2.T
         scrum_path / "templates" / filename,
     ]
 
+    for path in paths:
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            continue
+        return _cached_template(
+            config, str(path.resolve()), mtime, lambda: path.read_text()
+        )
+
+    # Only imported when needed, as it's slow to import
+    from importlib import resources
+
     # Check git history for previous version; this was modified for Python 3.11 support:
     # Python 3.13 files supports folder traversing in the path, 3.11 does not.
     module_path = resources.files("scrummd") / "templates" / filename
-    found_file = next(
-        (open(path, "rt") for path in paths if path.exists()),
-        (module_path.open("r") if module_path.is_file() else None),
-    )
+    if module_path.is_file():
+        # Module resources don't change while running
+        return _cached_template(
+            config, f"scrummd:{filename}", 0, lambda: module_path.read_text()
+        )
 
-    if found_file is None:
-        raise TemplateNotFoundError(filename, paths)
+    raise TemplateNotFoundError(filename, paths)
 
-    return env.from_string(found_file.read())
+
+def _cached_template(
+    config: scrummd.config.ScrumConfig,
+    name: str,
+    mtime: int,
+    read_source: Callable[[], str],
+) -> "jinja2.Template":
+    """Get a compiled template from the cache, compiling it if it's not cached or out of date"""
+    cached = _compiled_templates.get(name)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    template = _compile(config, name, read_source())
+    _compiled_templates[name] = (mtime, template)
+    return template
+
+
+def _compile(
+    config: scrummd.config.ScrumConfig, name: str, source: str
+) -> "jinja2.Template":
+    """Compile a template, using the bytecode cache if caching is enabled in the config"""
+    env = environment()
+    if not config.cache:
+        return env.from_string(source)
+
+    import jinja2
+
+    # The same as a jinja2 loader does with a bytecode cache, but without a loader - as where
+    # templates are loaded from depends on the config.
+    directory = cache_folder(config) / const.TEMPLATE_CACHE_FOLDER_NAME
+    bytecode_cache = jinja2.FileSystemBytecodeCache(str(directory))
+    bucket = bytecode_cache.get_bucket(env, name, name, source)
+    code = bucket.code
+    if code is None:
+        code = env.compile(source, name, name)
+        bucket.code = code
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            bytecode_cache.set_bucket(bucket)
+        except OSError as ex:
+            LOGGER.warning("Unable to cache template %s (%s)", name, ex)
+    return env.template_class.from_code(env, code, env.make_globals(None))
 
 
-@jinja2.pass_context
 def _apply_field_macros(
-    context: jinja2.runtime.Context,
+    context: "jinja2.runtime.Context",
     field: FieldStr,
 ) -> str:
     """Format any card references in a field str with the template
@@ -116,9 +203,6 @@ def _apply_field_macros(
     return response
 
 
-env.filters["apply_field_macros"] = _apply_field_macros
-
-
 def _is_interactive() -> bool:
     """Check if runing in an interactive terminal
 
@@ -150,21 +234,35 @@ class TemplateFields:
     meta: dict[str, FieldMetadata]
     """Metadata from the fields of original source md."""
 
+    backlinks: list["Card"]
+    """Cards that refer to the card."""
+
 
 import pprint
 
 
 def _template_fields(
-    config: scrummd.config.ScrumConfig, card: "Card", cards: "Collection"
+    config: scrummd.config.ScrumConfig,
+    card: "Card",
+    cards: "Collection",
+    interactive: Optional[bool] = None,
+    backlinks: Optional[dict[str, list[str]]] = None,
 ) -> TemplateFields:
-    """Fields to pass to the template"""
+    """Fields to pass to the template. interactive and backlinks are worked out if not passed."""
+    if backlinks is None:
+        backlinks = build_backlinks(cards)
     return TemplateFields(
         config=config,
         card=card,
         cards=cards,
-        interactive=_is_interactive(),
+        interactive=_is_interactive() if interactive is None else interactive,
         groups=card.parsed_md.keys_grouped_by_field_md_type(),
         meta=card.parsed_md._meta,  # TODO: Move _meta to a property or read only dict
+        backlinks=[
+            cards[card_index]
+            for card_index in backlinks.get(card.index, [])
+            if card_index in cards
+        ],
     )
 
 
@@ -173,6 +271,7 @@ def format(
     template_filename: str,
     card: "Card",
     collection: "Collection",
+    backlinks: Optional[dict[str, list[str]]] = None,
 ) -> str:
     """Format the card with the named template.
 
@@ -181,12 +280,140 @@ def format(
         template_filename (str): Name of template
         card (Card): Card to format
         collection (Collection): Collection of cards
+        backlinks (Optional[dict[str, list[str]]], optional): Backlinks of the cards (such as
+            CollectionIndex.backlinks), if they've already been found. Defaults to None (being
+            found from the collection).
 
     Returns:
         str: Card formatted per template
     """
     template = load_template(template_filename, config)
-    return template.render(**_template_fields(config, card, collection).__dict__)
+    return template.render(
+        **_template_fields(config, card, collection, backlinks=backlinks).__dict__
+    )
+
+
+def _render_all(
+    config: scrummd.config.ScrumConfig,
+    template: "jinja2.Template",
+    cards: Iterable["Card"],
+    collection: "Collection",
+    interactive: bool,
+    backlinks: dict[str, list[str]],
+) -> Iterator[str]:
+    """Render each card with an already loaded template"""
+    for card in cards:
+        yield template.render(
+            **_template_fields(
+                config, card, collection, interactive, backlinks
+            ).__dict__
+        )
+
+
+_worker_render: Optional[tuple] = None
+"""What the worker process renders with - config, template name, collection, interactive and
+backlinks - so it's only sent once per worker"""
+
+
+def _init_render_worker(
+    config: scrummd.config.ScrumConfig,
+    template_filename: str,
+    collection: "Collection",
+    interactive: bool,
+    backlinks: dict[str, list[str]],
+) -> None:
+    """Initializer for render worker processes"""
+    global _worker_render
+    _worker_render = (config, template_filename, collection, interactive, backlinks)
+
+
+def _render_chunk(card_indexes: list[str]) -> list[str]:
+    """Render a chunk of cards in a worker process"""
+    assert _worker_render is not None
+    config, template_filename, collection, interactive, backlinks = _worker_render
+    template = load_template(template_filename, config)
+    cards = [collection[card_index] for card_index in card_indexes]
+    return list(
+        _render_all(config, template, cards, collection, interactive, backlinks)
+    )
+
+
+def _format_parallel(
+    config: scrummd.config.ScrumConfig,
+    template_filename: str,
+    cards: list["Card"],
+    collection: "Collection",
+    interactive: bool,
+    backlinks: dict[str, list[str]],
+    workers: int,
+) -> Iterator[str]:
+    """Render cards across a pool of worker processes, yielding them in order"""
+    # Imported here, as it's only needed (and only worth the import) for many cards
+    from concurrent.futures import ProcessPoolExecutor
+
+    card_indexes = [card.index for card in cards]
+    chunk_size = max(1, min(MAX_RENDER_CHUNK_SIZE, len(card_indexes) // (workers * 4)))
+    chunks = [
+        card_indexes[start : start + chunk_size]
+        for start in range(0, len(card_indexes), chunk_size)
+    ]
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_render_worker,
+        initargs=(config, template_filename, collection, interactive, backlinks),
+    ) as executor:
+        for rendered_chunk in executor.map(_render_chunk, chunks):
+            yield from rendered_chunk
+
+
+def format_many(
+    config: scrummd.config.ScrumConfig,
+    template_filename: str,
+    cards: Iterable["Card"],
+    collection: "Collection",
+    backlinks: Optional[dict[str, list[str]]] = None,
+) -> Iterator[str]:
+    """Format many cards with the named template, yielding each in order as it's rendered
+
+    The template is loaded, the terminal checked and the backlinks found once for all of the
+    cards. If ``workers`` is configured and there's enough cards, they're rendered in worker
+    processes.
+
+    Args:
+        config (scrummd.config.ScrumConfig): Scrum Config
+        template_filename (str): Name of template
+        cards (Iterable[Card]): Cards to format
+        collection (Collection): Collection of cards
+        backlinks (Optional[dict[str, list[str]]], optional): Backlinks of the cards (such as
+            CollectionIndex.backlinks), if they've already been found. Defaults to None (being
+            found from the collection).
+
+    Yields:
+        str: Each card formatted per template
+    """
+    template = load_template(template_filename, config)
+    interactive = _is_interactive()
+    if backlinks is None:
+        backlinks = build_backlinks(collection)
+
+    workers = worker_count(config)
+    if workers > 1:
+        cards = list(cards)
+        if len(cards) >= PARALLEL_RENDER_THRESHOLD and all(
+            collection.get(card.index) is card for card in cards
+        ):
+            yield from _format_parallel(
+                config,
+                template_filename,
+                cards,
+                collection,
+                interactive,
+                backlinks,
+                workers,
+            )
+            return
+
+    yield from _render_all(config, template, cards, collection, interactive, backlinks)
 
 
 def format_from_str(
@@ -194,6 +421,7 @@ def format_from_str(
     template: str,
     card: "Card",
     collection: "Collection",
+    backlinks: Optional[dict[str, list[str]]] = None,
 ) -> str:
     """Format a card with the provided template.
 
@@ -202,11 +430,14 @@ def format_from_str(
         template (str): Template to use
         card (Card): Card to format
         collection (Collection): Collection of cards
+        backlinks (Optional[dict[str, list[str]]], optional): Backlinks of the cards (such as
+            CollectionIndex.backlinks), if they've already been found. Defaults to None (being
+            found from the collection).
 
     Returns:
         str: Card formatted per template
     """
-    compiled_template = env.from_string(template)
+    compiled_template = environment().from_string(template)
     return compiled_template.render(
-        **_template_fields(config, card, collection).__dict__
+        **_template_fields(config, card, collection, backlinks=backlinks).__dict__
     )
@@ -0,0 +1,550 @@
+"""Finding and reading the card files in the scrum folder, either serially or in parallel."""
+
+from collections import deque
+import contextlib
+import itertools
+import locale
+import logging
+import mmap
+import os
+import pathlib
+from collections.abc import Generator, Iterable, Iterator
+from typing import TYPE_CHECKING, Optional
+
+from scrummd.cache import CacheKey, ParseCache, file_key
+from scrummd.card import Card, from_parsed, from_str
+from scrummd.config import ScrumConfig
+from scrummd.exceptions import ValidationError
+from scrummd.source_md import extract_mapped_fields
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+CardPath = tuple[pathlib.Path, str]
+"""Path of a card file, and the collection implied by that path"""
+
+LoadResult = tuple[pathlib.Path, Card | ValidationError]
+"""Path of a card file, and either the card in it or why it's invalid"""
+
+PARALLEL_THRESHOLD = 64
+"""Fewest cards to parse before it's worth starting worker processes"""
+
+LOAD_BATCH_SIZE = 1024
+"""Most card files to check against the cache (and hand to workers) before yielding their cards"""
+
+MAX_CHUNK_SIZE = 64
+"""Most cards to send to a worker process at once"""
+
+
+def card_paths(config: ScrumConfig) -> Iterator[CardPath]:
+    """Find all the card files in the scrum folder, in the order they're loaded in
+
+    The files in each folder come first (in the order the folder lists them), then the files in
+    each of its subfolders. Files and folders starting with . are ignored, and ignored folders
+    aren't looked in at all.
+
+    Args:
+        config (ScrumConfig): ScrumMD Configuration to use
+
+    Yields:
+        CardPath: Path of each card, and the collection implied by the path
+    """
+    yield from _walk(config.scrum_path, "")
+
+
+def _walk(folder: str, collection_from_path: str) -> Iterator[CardPath]:
+    """Internal recursive function to card_paths (in the same order as os.walk, following links)"""
+    files: list[str] = []
+    subfolders: list[tuple[str, str]] = []
+    try:
+        entries = os.scandir(folder)
+    except OSError:
+        # Like os.walk, skip what can't be listed
+        return
+    with entries:
+        for entry in entries:
+            if entry.name[0] == ".":
+                continue
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                # So - this'll turn "scrum/backlog/special" into "backlog.special"
+                subcollection = ".".join(
+                    filter(None, [collection_from_path, entry.name])
+                )
+                subfolders.append((entry.path, subcollection))
+            else:
+                files.append(entry.path)
+
+    for path in files:
+        yield pathlib.Path(path), collection_from_path
+    for subfolder, subcollection in subfolders:
+        yield from _walk(subfolder, subcollection)
+
+
+def card_path(config: ScrumConfig, path: str | pathlib.Path) -> Optional[CardPath]:
+    """Locate a single file in the scrum folder, as card_paths would find it
+
+    Args:
+        config (ScrumConfig): ScrumMD Configuration to use
+        path (str | pathlib.Path): Path of the file - either as card_paths would give it, or any
+            other path that resolves to a file in the scrum folder
+
+    Returns:
+        Optional[CardPath]: Path of the card (as card_paths would give it), and the collection
+            implied by the path. None if the file is ignored or outside of the scrum folder.
+    """
+    collection_path = pathlib.Path(config.scrum_path)
+    path = pathlib.Path(path)
+    try:
+        parts = path.relative_to(collection_path).parts
+    except ValueError:
+        try:
+            parts = path.resolve().relative_to(collection_path.resolve()).parts
+        except ValueError:
+            return None
+
+    if len(parts) == 0 or any(part[0] == "." for part in parts):
+        return None
+    return pathlib.Path(collection_path, *parts), ".".join(parts[:-1])
+
+
+def read_contents(config: ScrumConfig, path: pathlib.Path) -> str | bytes:
+    """Read the whole of a card file, as read_card would parse it
+
+    Args:
+        config (ScrumConfig): ScrumMD Configuration to use
+        path (pathlib.Path): Path of the card file
+
+    Returns:
+        str | bytes: The decoded contents, or the bytes if the io_mode is mmap
+    """
+    if config.io_mode == "mmap":
+        with open(path, "rb") as fo:
+            return fo.read()
+    with open(path, "r") as fo:
+        return fo.read()
+
+
+def read_card(
+    config: ScrumConfig,
+    path: pathlib.Path,
+    collection_from_path: str,
+    lazy: bool = False,
+    contents: Optional[str | bytes] = None,
+) -> Card:
+    """Read and parse a card file
+
+    Args:
+        config (ScrumConfig): ScrumMD Configuration to use
+        path (pathlib.Path): Path of the card file
+        collection_from_path (str): Collection implied by the path of the card
+        lazy (bool, optional): Defer parsing fields that aren't needed to create the card (see
+            Card.resolve). Defaults to False.
+        contents (Optional[str | bytes], optional): Contents of the file, if they've already been
+            read with read_contents. Defaults to None (reading the file).
+
+    Raises:
+        ValidationError: The card is not valid
+
+    Returns:
+        Card: The card in the file
+    """
+    if contents is None and config.io_mode == "mmap":
+        with _mapped(path) as mapped:
+            parsed = extract_mapped_fields(config, mapped, str(path), lazy)
+        return from_parsed(config, parsed, collection_from_path, path)
+
+    if contents is None:
+        contents = read_contents(config, path)
+    if isinstance(contents, bytes):
+        parsed = extract_mapped_fields(config, contents, str(path), lazy)
+        return from_parsed(config, parsed, collection_from_path, path)
+    return from_str(config, contents, collection_from_path, path, lazy)
+
+
+@contextlib.contextmanager
+def _mapped(path: pathlib.Path) -> Iterator[mmap.mmap | bytes]:
+    """Map a file into memory for reading (empty files, which can't be mapped, are just bytes)"""
+    with open(path, "rb") as fo:
+        if os.fstat(fo.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(fo.fileno(), 0, access=mmap.ACCESS_READ) as contents:
+            yield contents
+
+
+def _contains(config: ScrumConfig, path: pathlib.Path, needles: Iterable[str]) -> bool:
+    """Whether a file has any of the strings in it
+
+    With the mmap io_mode, the strings are found in the file's bytes without decoding them.
+    """
+    if config.io_mode == "mmap":
+        encoding = locale.getpreferredencoding(False)
+        with _mapped(path) as contents:
+            return any(
+                contents.find(needle.encode(encoding)) != -1 for needle in needles
+            )
+
+    with open(path, "r") as fo:
+        text = fo.read()
+    return any(needle in text for needle in needles)
+
+
+def _parse(
+    config: ScrumConfig,
+    path: pathlib.Path,
+    collection_from_path: str,
+    lazy: bool,
+    contents: Optional[str | bytes] = None,
+) -> Card | ValidationError:
+    """Parse a card, returning rather than raising a ValidationError"""
+    try:
+        return read_card(config, path, collection_from_path, lazy, contents)
+    except ValidationError as ex:
+        return ex
+
+
+def _prefetched(
+    config: ScrumConfig, to_read: Iterable[CardPath]
+) -> Iterator[tuple[pathlib.Path, str, str | bytes]]:
+    """Read card files ahead of parsing them, in a pool of ``prefetch`` threads
+
+    Up to ``prefetch`` files are being read at once, while the earlier ones are parsed. They're
+    yielded in the order they were given, and any error reading a file is raised when it's reached.
+    """
+    # Imported here, as it's only needed (and only worth the import) when prefetching
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    pending: deque[tuple[pathlib.Path, str, Future[str | bytes]]] = deque()
+    with ThreadPoolExecutor(
+        max_workers=config.prefetch, thread_name_prefix="scrummd-prefetch"
+    ) as executor:
+        try:
+            for path, collection_from_path in to_read:
+                future = executor.submit(read_contents, config, path)
+                pending.append((path, collection_from_path, future))
+                if len(pending) > config.prefetch:
+                    path, collection_from_path, future = pending.popleft()
+                    yield path, collection_from_path, future.result()
+            while pending:
+                path, collection_from_path, future = pending.popleft()
+                yield path, collection_from_path, future.result()
+        finally:
+            # Abandoned part way through - don't read any more than has been started
+            for *_, future in pending:
+                future.cancel()
+
+
+def _load_serial(
+    config: ScrumConfig, to_parse: Iterable[CardPath], lazy: bool
+) -> Generator[LoadResult, None, None]:
+    """Parse cards in this process, prefetching the files if configured to"""
+    if config.prefetch > 0:
+        for path, collection_from_path, contents in _prefetched(config, to_parse):
+            yield path, _parse(config, path, collection_from_path, lazy, contents)
+    else:
+        for path, collection_from_path in to_parse:
+            yield path, _parse(config, path, collection_from_path, lazy)
+
+
+_worker_config: Optional[ScrumConfig] = None
+"""Config of the worker process, so it's only sent once per worker"""
+
+_worker_lazy = False
+"""Whether the worker process parses cards lazily"""
+
+
+def _init_worker(config: ScrumConfig, lazy: bool) -> None:
+    """Initializer for worker processes"""
+    global _worker_config, _worker_lazy
+    _worker_config = config
+    _worker_lazy = lazy
+
+
+def _parse_chunk(chunk: list[CardPath]) -> list[Card | Exception]:
+    """Parse a chunk of cards in a worker process
+
+    Every exception is returned in place of its card rather than raised, so that the main process
+    can raise it at the same point as it would be raised when loading serially.
+    """
+    assert _worker_config is not None
+    results: list[Card | Exception] = []
+    for path, collection_from_path in chunk:
+        try:
+            results.append(
+                read_card(_worker_config, path, collection_from_path, _worker_lazy)
+            )
+        except Exception as ex:
+            results.append(ex)
+    return results
+
+
+def worker_count(config: ScrumConfig) -> int:
+    """Amount of worker processes to use for the config
+
+    Args:
+        config (ScrumConfig): ScrumMD Configuration to use
+
+    Returns:
+        int: Amount of workers. 1 means loading in this process.
+    """
+    if config.workers > 0:
+        return config.workers
+    return os.cpu_count() or 1
+
+
+def _worker_pool(
+    config: ScrumConfig, workers: int, lazy: bool
+) -> "ProcessPoolExecutor":
+    """Start a pool of worker processes to parse cards with"""
+    # Imported here, as it's only needed (and only worth the import) for big collections
+    from concurrent.futures import ProcessPoolExecutor
+
+    return ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(config, lazy)
+    )
+
+
+def _load_parallel(
+    config: ScrumConfig,
+    to_parse: list[CardPath],
+    workers: int,
+    executor: "ProcessPoolExecutor",
+) -> Generator[LoadResult, None, None]:
+    """Parse cards across a pool of worker processes, yielding them in order"""
+    chunk_size = max(1, min(MAX_CHUNK_SIZE, len(to_parse) // (workers * 4)))
+    chunks = [
+        to_parse[start : start + chunk_size]
+        for start in range(0, len(to_parse), chunk_size)
+    ]
+    futures = [executor.submit(_parse_chunk, chunk) for chunk in chunks]
+    try:
+        for chunk, future in zip(chunks, futures):
+            for (path, _), result in zip(chunk, future.result()):
+                if isinstance(result, Card):
+                    # Cards share the config of this process, not the pickled copy
+                    result._config = config
+                elif not isinstance(result, ValidationError):
+                    raise result
+                yield path, result
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def load_cards(
+    config: ScrumConfig,
+    parse_cache: Optional[ParseCache] = None,
+    to_load: Optional[Iterable[CardPath]] = None,
+    lazy: bool = False,
+) -> Iterator[LoadResult]:
+    """Load every card in the scrum folder, in the order they're found
+
+    Uses cached cards where the cache is up to date, and parses the rest (in worker processes if
+    ``workers`` is configured, and there's enough of them to be worth it). The files are checked
+    against the cache and parsed LOAD_BATCH_SIZE at a time, so the first cards are yielded without
+    waiting for every file to be found.
+
+    Args:
+        config (ScrumConfig): ScrumMD Configuration to use
+        parse_cache (Optional[ParseCache]): Cache of parsed cards, if caching is enabled
+        to_load (Optional[Iterable[CardPath]]): Card files to load. Defaults to all of them.
+        lazy (bool, optional): Defer parsing fields that aren't needed to create the cards (see
+            Card.resolve). Defaults to False.
+
+    Yields:
+        LoadResult: Each card file, and the card or the ValidationError from reading it
+    """
+    workers = worker_count(config)
+    if to_load is None:
+        to_load = card_paths(config)
+
+    if workers == 1 and parse_cache is None:
+        yield from _load_serial(config, to_load, lazy)
+        return
+
+    to_load = iter(to_load)
+    with contextlib.ExitStack() as stack:
+        # Started when first needed, then used for every batch
+        executor: Optional["ProcessPoolExecutor"] = None
+        while batch := list(itertools.islice(to_load, LOAD_BATCH_SIZE)):
+            # Check the cache first, so that only the cards that need parsing are handed to
+            # workers
+            cached: list[Optional[Card]] = []
+            keys: list[Optional[CacheKey]] = []
+            to_parse: list[CardPath] = []
+            for path, collection_from_path in batch:
+                key: Optional[CacheKey] = None
+                if parse_cache is not None:
+                    with contextlib.suppress(OSError):
+                        # If it can't be read, that's raised when it's parsed, in its turn
+                        key = file_key(os.stat(path))
+                keys.append(key)
+                cached.append(
+                    None
+                    if parse_cache is None or key is None
+                    else parse_cache.get(str(path), key)
+                )
+                if cached[-1] is None:
+                    to_parse.append((path, collection_from_path))
+
+            parsed: Generator[LoadResult, None, None]
+            if workers > 1 and len(to_parse) >= PARALLEL_THRESHOLD:
+                if executor is None:
+                    executor = stack.enter_context(_worker_pool(config, workers, lazy))
+                parsed = _load_parallel(config, to_parse, workers, executor)
+            else:
+                parsed = _load_serial(config, to_parse, lazy)
+
+            try:
+                for (path, _), cached_card, key in zip(batch, cached, keys):
+                    if cached_card is not None:
+                        if not lazy:
+                            # It may have been cached by a lazy load
+                            cached_card.resolve()
+                        yield path, cached_card
+                        continue
+
+                    _, result = next(parsed)
+                    if parse_cache is not None and key is not None:
+                        if isinstance(result, Card):
+                            parse_cache.put(str(path), key, result)
+                        else:
+                            # Invalid cards aren't cached, so that they're reported every run
+                            parse_cache.discard(str(path))
+                    yield path, result
+            finally:
+                # Stops the workers if loading is abandoned part way through (say, on a strict
+                # error)
+                parsed.close()
+
+
+def _in_collection(collection: str, collection_name: str) -> bool:
+    """Whether being in ``collection`` also puts a card in ``collection_name``
+
+    Being in "backlog.special" means being in "backlog" too.
+    """
+    return collection == collection_name or collection.startswith(collection_name + ".")
+
+
+def is_path_collection(config: ScrumConfig, collection_name: str) -> bool:
+    """Whether a collection is implied by a folder in the scrum folder
+
+    Args:
+        config (ScrumConfig): ScrumMD Configuration to use
+        collection_name (str): Name of the collection, like "backlog.special"
+
+    Returns:
+        bool: True if there is a matching (non-ignored) folder
+    """
+    parts = collection_name.split(".")
+    if any(len(part) == 0 or part[0] == "." for part in parts):
+        return False
+    return pathlib.Path(config.scrum_path, *parts).is_dir()
+
+
+def _contributes(card: Card, collection_name: str) -> bool:
+    """Whether a card adds itself or other cards to a collection"""
+    return (
+        any(_in_collection(tag, collection_name) for tag in card.collections)
+        or card.index == collection_name
+        or collection_name in card.defined_collections
+    )
+
+
+def _might_contribute(
+    config: ScrumConfig, path: pathlib.Path, collection_name: str
+) -> bool:
+    """Whether a card file might add itself or other cards to a collection, without parsing it
+
+    This errs on the side of caution. Any card that could add to the collection (with a tag, by
+    defining it in its fields, or by having an index it's a subcollection of) must either have a
+    filename the collection starts with, or mention the first part of the collection's name
+    somewhere in its file.
+    """
+    stem = path.name.split(".")[0]
+    if _in_collection(collection_name, stem):
+        return True
+    return _contains(config, path, [collection_name.split(".")[0]])
+
+
+def _mentions(config: ScrumConfig, path: pathlib.Path, indexes: set[str]) -> bool:
+    """Whether a card file might be the card for any of the indexes, without parsing it"""
+    if path.name.split(".")[0] in indexes:
+        return True
+    return _contains(config, path, indexes)
+
+
+def load_collection_cards(
+    config: ScrumConfig,
+    collection_name: str,
+    parse_cache: Optional[ParseCache] = None,
+    lazy: bool = False,
+) -> Iterator[LoadResult]:
+    """Load only the cards needed to build a collection implied by a folder
+
+    Every card in the collection's folder is loaded, along with the cards elsewhere that a cheap
+    scan of the file says could add to the collection (by tags, collections or references). If
+    those define the collection with references to cards that haven't been loaded, the files that
+    might be those cards are loaded too.
+
+    Cards outside of the collection aren't loaded, so aren't validated either.
+
+    Args:
+        config (ScrumConfig): ScrumMD Configuration to use
+        collection_name (str): Name of the collection - see is_path_collection
+        parse_cache (Optional[ParseCache]): Cache of parsed cards, if caching is enabled
+        lazy (bool, optional): Defer parsing fields that aren't needed to create the cards (see
+            Card.resolve). Defaults to False.
+
+    Yields:
+        LoadResult: Each loaded card file (in the same order as load_cards), and the card or the
+            ValidationError from reading it
+    """
+    all_paths = list(card_paths(config))
+    selected: list[CardPath] = []
+    for path, collection_from_path in all_paths:
+        if _in_collection(collection_from_path, collection_name):
+            selected.append((path, collection_from_path))
+            continue
+
+        cached_card = None
+        if parse_cache is not None:
+            cached_card = parse_cache.get(str(path), file_key(os.stat(path)))
+        if cached_card is not None:
+            # Already parsed - so no need to guess
+            if _contributes(cached_card, collection_name):
+                selected.append((path, collection_from_path))
+        elif _might_contribute(config, path, collection_name):
+            selected.append((path, collection_from_path))
+
+    results = dict(load_cards(config, parse_cache, selected, lazy))
+
+    loaded_indexes = {
+        result.index for result in results.values() if isinstance(result, Card)
+    }
+    referenced: set[str] = {
+        referenced_index
+        for result in results.values()
+        if isinstance(result, Card)
+        for defined_name, defined_collection in result.defined_collections.items()
+        if defined_name == collection_name or result.index == collection_name
+        for referenced_index in defined_collection
+    }
+    missing = referenced - loaded_indexes
+    if missing:
+        extra = [
+            (path, collection_from_path)
+            for path, collection_from_path in all_paths
+            if path not in results and _mentions(config, path, missing)
+        ]
+        results.update(load_cards(config, parse_cache, extra, lazy))
+
+    for path, _ in all_paths:
+        if path in results:
+            yield path, results[path]
@@ -1,15 +1,31 @@
 """Generate a collection, and time accessing it for benchmarking common scrummd functions."""
 
 import argparse
+import dataclasses
 from pathlib import Path
 from statistics import mean
+import time
 import timeit
+import tracemalloc
 import logging
 import tempfile
 import contextlib
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
 import random
-from scrummd.collection import SortCriteria, get_collection, sort_collection
+import subprocess
+import sys
+from typing import Any
+from scrummd import loader
+from scrummd.collection import (
+    Filter,
+    SortCriteria,
+    filter_collection,
+    get_collection,
+    load_collection_index,
+    sort_collection,
+)
+from scrummd.snapshot import Snapshot, write_snapshot
+from scrummd.source_md import extract_fields
 from scrummd.version import version_to_output
 from scrummd.config import ScrumConfig
 
@@ -80,6 +96,117 @@ def scrum_repo(
     logging.info("Cleaned up")
 
 
+def time_executions(name: str, times: int, function: Callable[[], Any]) -> list[float]:
+    """Time a function a number of times, printing each time and the average
+
+    Args:
+        name (str): Name of what's being timed
+        times (int): Amount of times to run the function
+        function (Callable[[], Any]): Function to time
+
+    Returns:
+        list[float]: Time taken by each execution in seconds
+    """
+    print(f"{name} executions")
+    ex_times = []
+    for count in range(times):
+        ex_time = timeit.timeit(function, number=1)
+        ex_times.append(ex_time)
+        print(f"{count}: {ex_time} s")
+    print(f" Avg: {mean(ex_times)} s")
+    return ex_times
+
+
+def memory_per_card(config: ScrumConfig) -> float:
+    """Memory held by a loaded collection, per card
+
+    Args:
+        config (ScrumConfig): The ScrumConfig to load the collection with
+
+    Returns:
+        float: Bytes allocated (and still held) per card while loading the collection
+    """
+    tracemalloc.start()
+    try:
+        collection = get_collection(config)
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current / max(1, len(collection))
+
+
+@contextlib.contextmanager
+def simulated_latency(seconds: float) -> Iterator[None]:
+    """Delay every read of a card file, as a slow (such as a network) filesystem would
+
+    Args:
+        seconds (float): Delay before each read
+    """
+    original = loader.read_contents
+
+    def slow_read_contents(config: ScrumConfig, path: Path) -> str | bytes:
+        time.sleep(seconds)
+        return original(config, path)
+
+    loader.read_contents = slow_read_contents
+    try:
+        yield
+    finally:
+        loader.read_contents = original
+
+
+def snapshot_total(path: Path, field_name: str) -> float:
+    """Open a snapshot, and sum the numbers in one of its columns
+
+    Args:
+        path (Path): Snapshot file
+        field_name (str): Field to sum
+
+    Returns:
+        float: Sum of the field
+    """
+    with Snapshot(path) as snapshot:
+        return snapshot.column(field_name).total()
+
+
+COMMAND_MODULES = [
+    "scrummd.sbl.sbl",
+    "scrummd.scard",
+    "scrummd.sboard",
+    "scrummd.svalid",
+    "scrummd.swrite",
+    "scrummd.sdaemon",
+    "scrummd.sexport",
+]
+"""Modules of the commands whose startup is benchmarked"""
+
+
+def import_time(module: str) -> tuple[float, set[str]]:
+    """Time to import a module in a new interpreter, as reported by ``python -X importtime``
+
+    Args:
+        module (str): Name of the module
+
+    Returns:
+        tuple[float, set[str]]: Seconds to import the module (and everything it imports), and the
+            names of the top level packages it imported
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    # Each line is "import time: self [us] | cumulative | name"; the module itself is last
+    lines = [
+        line.split("|")
+        for line in completed.stderr.splitlines()
+        if line.startswith("import time:") and "cumulative" not in line
+    ]
+    packages = {name.strip().split(".")[0] for *_, name in lines}
+    return int(lines[-1][1]) / 1_000_000, packages
+
+
 def create_parser() -> argparse.ArgumentParser:
     """Return argument parser for sbench
 
@@ -97,10 +224,25 @@ def create_parser() -> argparse.ArgumentParser:
         "--size", help="Minimum size of each card in bytes", default=1000
     )
     parser.add_argument("--times", help="Times to test collection", default=5)
-    parser.add_argument("--sorts", help="Amount of sort criteria to sort by", default=2)
+    parser.add_argument(
+        "--sorts", help="Amount of sort criteria to sort by", type=int, default=2
+    )
     # parser.add_argument(
     #    "--cache", help="Test twice each time to test caching time", action="store_true"
     # )
+    parser.add_argument(
+        "--latency",
+        help="Milliseconds to delay reading each card file by, to compare loading with and "
+        + "without prefetching on a slow filesystem. 0 skips the comparison.",
+        type=float,
+        default=0,
+    )
+    parser.add_argument(
+        "--prefetch",
+        help="Prefetch depth to compare against no prefetching, with --latency",
+        type=int,
+        default=16,
+    )
     parser.add_argument("-v", help="Level of verbosity", action="count", default=0)
     parser.add_argument(
         "--version",
@@ -119,32 +261,88 @@ def entry():
 
     logging.basicConfig(level=30 - args.v * 10)
 
+    print("Import times")
+    for module in COMMAND_MODULES:
+        seconds, packages = import_time(module)
+        note = " (imports jinja2)" if "jinja2" in packages else ""
+        print(f"{module}: {seconds:.3f} s{note}")
+    print()
+
     with scrum_repo(
         int(args.count), int(args.references), int(args.size), int(args.sorts)
     ) as config:
-        times = []
-        print(f"get_collection executions")
-        for count in range(int(args.times)):
-            ex_time = timeit.timeit(lambda: get_collection(config), number=1)
-            times.append(ex_time)
-            print(f"{count}: {ex_time} s")
-        print(f" Avg: {mean(times)} s")
+        time_executions(
+            "get_collection", int(args.times), lambda: get_collection(config)
+        )
+
+        # Parsing alone, without reading the files
+        card_texts = [path.read_text() for path in Path(config.scrum_path).iterdir()]
+        print()
+        time_executions(
+            "extract_fields",
+            int(args.times),
+            lambda: [extract_fields(config, card_text) for card_text in card_texts],
+        )
+
+        print(f"\nMemory: {memory_per_card(config):.0f} bytes per card")
+
+        if args.latency > 0:
+            with simulated_latency(args.latency / 1000):
+                for prefetch in sorted({0, args.prefetch}):
+                    prefetch_config = dataclasses.replace(config, prefetch=prefetch)
+                    print()
+                    time_executions(
+                        f"get_collection ({args.latency} ms latency, prefetch {prefetch})",
+                        int(args.times),
+                        lambda: get_collection(prefetch_config),
+                    )
+
+        # Summing a field from a snapshot, rather than parsing every card. The snapshot is kept
+        # out of the scrum folder, where it'd be read as a card.
+        with tempfile.TemporaryDirectory() as snapshot_dir:
+            snapshot_path = Path(snapshot_dir, "snapshot.smds")
+            write_snapshot(get_collection(config), snapshot_path)
+            print()
+            time_executions(
+                "Snapshot total",
+                int(args.times),
+                lambda: snapshot_total(snapshot_path, "s0"),
+            )
 
         if args.sorts > 0:
-            sort_times = []
             collection = get_collection(config)
-            print("\nsort_collection executions")
             criteria = [
                 SortCriteria(f"s{sort_number}", False)
                 for sort_number in range(args.sorts)
             ]
-            for count in range(int(args.times)):
-                ex_time = timeit.timeit(
-                    lambda: sort_collection(collection, criteria), number=1
-                )
-                sort_times.append(ex_time)
-                print(f"{count}: {ex_time} s")
-            print(f" Avg: {mean(sort_times)} s")
+            print()
+            time_executions(
+                "sort_collection",
+                int(args.times),
+                lambda: sort_collection(collection, criteria),
+            )
+
+            # The sort fields double as fields to filter on
+            collection_index = load_collection_index(config)
+            filters = [
+                Filter(f"s{sort_number}", ["1", "2", "3"])
+                for sort_number in range(args.sorts)
+            ]
+            print()
+            time_executions(
+                "filter_collection",
+                int(args.times),
+                lambda: filter_collection(collection_index.all_cards, filters),
+            )
+            # The first run builds the index for each field; the rest reuse it
+            print()
+            time_executions(
+                "filter_collection (indexed)",
+                int(args.times),
+                lambda: filter_collection(
+                    collection_index.all_cards, filters, collection_index
+                ),
+            )
 
 
 if __name__ == "__main__":
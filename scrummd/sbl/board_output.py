@@ -4,6 +4,7 @@ from scrummd.collection import Groups, Collection
 from scrummd.config import ScrumConfig
 from scrummd.sbl.output import OutputConfig, UnsupportedOutputError
 import os
+import sys
 
 MIN_COLUMN_WIDTH = 15
 
@@ -28,11 +29,21 @@ def _format_field(field: str, width: int) -> str:
         return stripped_field + " " * (width - len(stripped_field))
 
 
+def _terminal_width() -> Optional[int]:
+    """Width of the terminal, or None if it can't be found (say, if output is redirected)"""
+    try:
+        return os.get_terminal_size().columns
+    except OSError:
+        return None
+
+
 def _output_last_level_groups(
     config: ScrumConfig,
     output_config: OutputConfig,
     board_config: BoardConfig,
     groups: Groups,
+    terminal_width: Optional[int],
+    lines: list[str],
 ):
     """Output the first level of groups that's actually split
 
@@ -41,58 +52,48 @@ def _output_last_level_groups(
         output_config (OutputConfig): Output specific config
         board_config (BoardConfig): Board specific configuration
         groups (Groups): Final level of groups to display
+        terminal_width (Optional[int]): Width of the terminal, if known
+        lines (list[str]): Lines of output, which the board's lines are added to
     """
     group_count = len(groups)
     if group_count == 0:
         return
-    try:
-        terminal_width = os.get_terminal_size().columns
+    if terminal_width is not None:
         column_width = board_config.override_column_width or max(
             (terminal_width) // group_count, board_config.minimum_column_width
         )
         too_many = column_width * group_count > terminal_width
-    except OSError:
+    else:
         # Can't get width of terminal
         column_width = board_config.default_column_width
         too_many = False
 
     if too_many:
+        assert terminal_width is not None
         display_count = terminal_width // column_width
         keys = list(groups.keys())[0:display_count]
     else:
         display_count = group_count
         keys = list(groups.keys())
 
-    # Print headers
-    header_row = ""
-    for _, group_key in enumerate(keys):
-        if len(str(group_key)) > (column_width - 1):
-            header_value = str(group_key)[: column_width - 1] + "…"
-        else:
-            header_value = str(group_key) + " " * (
-                column_width - 1 - len(str(group_key))
-            )
-        header_row += "|" + header_value
-
-    if too_many:
-        header_row += ">"
-    else:
-        header_row += "|"
-    print(header_row)
-
-    border_row = ""
-    for _ in range(display_count):
-        border_row += "|" + "-" * (column_width - 1)
-
-    if too_many:
-        border_row += ">"
-    else:
-        border_row += "|"
-    print(border_row)
-
     text_width = column_width - 1
+    row_end = ">" if too_many else "|"
 
-    # We build the strings for each column, and then display them line by line
+    # Print headers
+    header_cells = []
+    for group_key in keys:
+        header_value = str(group_key)
+        if len(header_value) > text_width:
+            header_cells.append(header_value[:text_width] + "…")
+        else:
+            header_cells.append(header_value.ljust(text_width))
+    lines.append("".join("|" + cell for cell in header_cells) + row_end)
+    lines.append(("|" + "-" * text_width) * display_count + row_end)
+
+    # We build the strings for each column, and then display them line by line. Cells are
+    # formatted once for each distinct value, as many cards share values (like their status).
+    formatted: dict[str, str] = {}
+    blank = " " * text_width
     output_columns: dict[str, list[str]] = {str(key): [] for key in keys}
     for group_key, group_value in groups.items():
         if group_key not in keys:
@@ -101,26 +102,19 @@ def _output_last_level_groups(
         output_list = output_columns[str(group_key)]
         for card in group_value.collection.values():
             for field_name in output_config.columns:
-                output_list.append(
-                    _format_field(str(card.get_field(field_name)), text_width)
-                )
-            output_list.append(" " * text_width)
-
-    for line_no in range(
-        max([len(value_column) for value_column in output_columns.values()])
-    ):
-        value_line = ""
-        for column in output_columns.values():
-            if len(column) > line_no:
-                value_line += "|" + column[line_no]
-            else:
-                value_line += "|" + " " * (column_width - 1)
-
-        if too_many:
-            value_line += ">"
-        else:
-            value_line += "|"
-        print(value_line)
+                value = str(card.get_field(field_name))
+                cell = formatted.get(value)
+                if cell is None:
+                    cell = formatted[value] = _format_field(value, text_width)
+                output_list.append(cell)
+            output_list.append(blank)
+
+    columns = list(output_columns.values())
+    row_count = max((len(column) for column in columns), default=0)
+    for column in columns:
+        column.extend([blank] * (row_count - len(column)))
+    for row in zip(*columns):
+        lines.append("|" + "|".join(row) + row_end)
 
 
 def _output_group(
@@ -129,10 +123,11 @@ def _output_group(
     board_config: BoardConfig,
     collection: Groups,
     group_fields: list[str],
+    terminal_width: Optional[int],
+    lines: list[str],
     level=1,
 ):
-    """Output groups to stdout in multiple levels in a scrum-board style
-        format
+    """Output groups in multiple levels in a scrum-board style format
 
     Args:
         config (ScrumConfig): Active scrummd configuration
@@ -140,20 +135,28 @@ def _output_group(
         board_config (BoardConfig): Board specific configuration
         collection (Groups): Collection to output to the screen
         group_fields (list[str]): Fields that are being grouped by
+        terminal_width (Optional[int]): Width of the terminal, if known
+        lines (list[str]): Lines of output, which the board's lines are added to
         level (int, optional): For internal use in recursion only. Defaults to 1.
     """
     if len(group_fields) == 1:
-        _output_last_level_groups(config, output_config, board_config, collection)
+        _output_last_level_groups(
+            config, output_config, board_config, collection, terminal_width, lines
+        )
         return
     for group_key, cards in collection.items():
         if not output_config.omit_headers:
-            print(f"[" * level + group_fields[0] + " = " + str(group_key) + "]" * level)
+            lines.append(
+                f"[" * level + group_fields[0] + " = " + str(group_key) + "]" * level
+            )
         _output_group(
             config,
             output_config,
             board_config,
             cards.groups,
             group_fields[1:],
+            terminal_width,
+            lines,
             level + 1,
         )
 
@@ -166,15 +169,26 @@ def board_grouped_output(
 ) -> None:
     """Output a board to the console using the current display size
 
+    The whole board is written to stdout at once.
+
     Args:
         config (ScrumConfig): ScrumConfig
         output_config (OutputConfig): Output specific config
         board_config (BoardConfig): Configuration related to the board output specifically
         groups (Groups): Groups to output
     """
-
-    _output_group(config, output_config, board_config, groups, output_config.group_by)
-    # _output_last_level_groups(config, output_config, groups)
+    lines: list[str] = []
+    _output_group(
+        config,
+        output_config,
+        board_config,
+        groups,
+        output_config.group_by,
+        _terminal_width(),
+        lines,
+    )
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 def board_ungrouped_output(
@@ -0,0 +1,160 @@
+"""Output cards as CSV or TSV - a row for each card, quoted where needed"""
+
+from collections.abc import Iterable, Iterator
+import csv
+import sys
+from typing import Optional
+from scrummd.card import Card
+from scrummd.collection import Groups, Collection
+from scrummd.config import ScrumConfig
+from scrummd.scard import format_field
+from scrummd.source_md import Field, FieldNumber
+from .output import OutputConfig
+
+
+def _format_key(group_key: Optional[str | Field]) -> str:
+    """Format a group key like the field it came from"""
+    if group_key is None:
+        return ""
+    if isinstance(group_key, FieldNumber):
+        return format_field(group_key)
+    return str(group_key)
+
+
+def _group_rows(
+    groups: Groups, keys: list[str], columns: list[str]
+) -> Iterator[list[str]]:
+    """Internal recursive function to output grouped rows, each starting with its group keys"""
+    for group_key, group in groups.items():
+        group_keys = keys + [_format_key(group_key)]
+        yield from _group_rows(group.groups, group_keys, columns)
+        for card in group.collection.values():
+            yield group_keys + [format_field(card.get_field(col)) for col in columns]
+
+
+def _card_rows(cards: Iterable[Card], columns: list[str]) -> Iterator[list[str]]:
+    """Rows of the columns of each card"""
+    for card in cards:
+        yield [format_field(card.get_field(col)) for col in columns]
+
+
+def _write_rows(
+    delimiter: str,
+    output_config: OutputConfig,
+    rows: Iterable[list[str]],
+) -> None:
+    """Write the header (unless omitted) and every row, as they're made"""
+    writer = csv.writer(sys.stdout, delimiter=delimiter, lineterminator="\n")
+    if not output_config.omit_headers:
+        writer.writerow(output_config.group_by + output_config.columns)
+    for row in rows:
+        writer.writerow(row)
+
+
+def _write_groups(delimiter: str, output_config: OutputConfig, groups: Groups) -> None:
+    """Write groups, with the keys of the fields grouped by as the first columns"""
+    _write_rows(
+        delimiter, output_config, _group_rows(groups, [], output_config.columns)
+    )
+
+
+def csv_grouped_output(
+    config: ScrumConfig,
+    output_config: OutputConfig,
+    csv_config: None,
+    groups: Groups,
+) -> None:
+    """Output groups to stdout as CSV, with a leading column for each field grouped by
+
+    Args:
+        config (ScrumConfig): ScrumConfig
+        output_config (OutputConfig): Output specific config
+        csv_config (None): Not used (yet)
+        groups (Groups): Groups to output
+    """
+    _write_groups(",", output_config, groups)
+
+
+def csv_ungrouped_output(
+    config: ScrumConfig,
+    output_config: OutputConfig,
+    csv_config: None,
+    collection: Collection,
+) -> None:
+    """Output collection to stdout as CSV
+
+    Args:
+        config (ScrumConfig): ScrumConfig
+        output_config (OutputConfig): Output specific config
+        csv_config (None): Not used (yet)
+        collection (Collection): Collection of cards to output
+    """
+    csv_stream_output(config, output_config, csv_config, collection.values())
+
+
+def csv_stream_output(
+    config: ScrumConfig,
+    output_config: OutputConfig,
+    csv_config: None,
+    cards: Iterable[Card],
+) -> None:
+    """Output cards to stdout as CSV, as they arrive
+
+    Args:
+        config (ScrumConfig): ScrumConfig
+        output_config (OutputConfig): Output specific config
+        csv_config (None): Not used (yet)
+        cards (Iterable[Card]): Cards to output, such as from iter_cards
+    """
+    _write_rows(",", output_config, _card_rows(cards, output_config.columns))
+
+
+def tsv_grouped_output(
+    config: ScrumConfig,
+    output_config: OutputConfig,
+    tsv_config: None,
+    groups: Groups,
+) -> None:
+    """Output groups to stdout as TSV, with a leading column for each field grouped by
+
+    Args:
+        config (ScrumConfig): ScrumConfig
+        output_config (OutputConfig): Output specific config
+        tsv_config (None): Not used (yet)
+        groups (Groups): Groups to output
+    """
+    _write_groups("\t", output_config, groups)
+
+
+def tsv_ungrouped_output(
+    config: ScrumConfig,
+    output_config: OutputConfig,
+    tsv_config: None,
+    collection: Collection,
+) -> None:
+    """Output collection to stdout as TSV
+
+    Args:
+        config (ScrumConfig): ScrumConfig
+        output_config (OutputConfig): Output specific config
+        tsv_config (None): Not used (yet)
+        collection (Collection): Collection of cards to output
+    """
+    tsv_stream_output(config, output_config, tsv_config, collection.values())
+
+
+def tsv_stream_output(
+    config: ScrumConfig,
+    output_config: OutputConfig,
+    tsv_config: None,
+    cards: Iterable[Card],
+) -> None:
+    """Output cards to stdout as TSV, as they arrive
+
+    Args:
+        config (ScrumConfig): ScrumConfig
+        output_config (OutputConfig): Output specific config
+        tsv_config (None): Not used (yet)
+        cards (Iterable[Card]): Cards to output, such as from iter_cards
+    """
+    _write_rows("\t", output_config, _card_rows(cards, output_config.columns))
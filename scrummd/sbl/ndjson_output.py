@@ -0,0 +1,110 @@
+"""Output cards as newline delimited JSON - one object per card, on its own line"""
+
+from collections.abc import Iterable, Iterator
+import json
+import sys
+from typing import Any, Optional
+from scrummd.card import Card
+from scrummd.collection import Groups, Collection
+from scrummd.config import ScrumConfig
+from scrummd.source_md import Field, FieldNumber
+from .output import OutputConfig
+
+
+def json_field(value: Optional[Field | str]) -> Any:
+    """Convert a field (or group key) to the value it's output as in JSON
+
+    Args:
+        value (Optional[Field | str]): Field to convert
+
+    Returns:
+        Any: None for a missing field, a number for a number, a list of strings for a list, or a
+            string
+    """
+    if isinstance(value, FieldNumber):
+        return int(value) if value.is_integer() else float(value)
+    if isinstance(value, list):
+        return [str(item) for item in value]
+    if value is None:
+        return None
+    return str(value)
+
+
+def _group_rows(
+    groups: Groups, group_fields: list[str], keys: dict[str, Any]
+) -> Iterator[tuple[dict[str, Any], Card]]:
+    """Internal recursive function to ndjson_grouped_output, yielding each card with its keys"""
+    for group_key, group in groups.items():
+        group_keys = keys | {group_fields[0]: json_field(group_key)}
+        yield from _group_rows(group.groups, group_fields[1:], group_keys)
+        for card in group.collection.values():
+            yield group_keys, card
+
+
+def _write_rows(
+    output_config: OutputConfig, rows: Iterable[tuple[dict[str, Any], Card]]
+) -> None:
+    """Write a line for each card, starting with the keys of the groups it's in"""
+    write = sys.stdout.write
+    for keys, card in rows:
+        values = keys | {
+            column: json_field(card.get_field(column))
+            for column in output_config.columns
+        }
+        write(json.dumps(values, ensure_ascii=False) + "\n")
+
+
+def ndjson_grouped_output(
+    config: ScrumConfig,
+    output_config: OutputConfig,
+    ndjson_config: None,
+    groups: Groups,
+) -> None:
+    """Output groups to stdout, as a line for each card with the group keys as extra fields
+
+    The group keys are named after the fields grouped by. Where a field is also a column, the
+    card's own value of it is output.
+
+    Args:
+        config (ScrumConfig): ScrumConfig
+        output_config (OutputConfig): Output specific config
+        ndjson_config (None): Not used (yet)
+        groups (Groups): Groups to output
+    """
+    _write_rows(output_config, _group_rows(groups, output_config.group_by, {}))
+
+
+def ndjson_ungrouped_output(
+    config: ScrumConfig,
+    output_config: OutputConfig,
+    ndjson_config: None,
+    collection: Collection,
+) -> None:
+    """Output collection to stdout
+
+    Args:
+        config (ScrumConfig): ScrumConfig
+        output_config (OutputConfig): Output specific config
+        ndjson_config (None): Not used (yet)
+        collection (Collection): Collection of cards to output
+    """
+    ndjson_stream_output(config, output_config, ndjson_config, collection.values())
+
+
+def ndjson_stream_output(
+    config: ScrumConfig,
+    output_config: OutputConfig,
+    ndjson_config: None,
+    cards: Iterable[Card],
+) -> None:
+    """Output cards to stdout as they arrive
+
+    There's no header line; every line has the columns as its keys.
+
+    Args:
+        config (ScrumConfig): ScrumConfig
+        output_config (OutputConfig): Output specific config
+        ndjson_config (None): Not used (yet)
+        cards (Iterable[Card]): Cards to output, such as from iter_cards
+    """
+    _write_rows(output_config, (({}, card) for card in cards))
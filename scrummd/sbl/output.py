@@ -1,4 +1,6 @@
+from collections.abc import Iterable
 from typing import Any, Callable, NamedTuple, Optional
+from scrummd.card import Card
 from scrummd.collection import Groups, Collection, SortCriteria
 from scrummd.config import ScrumConfig
 
@@ -24,3 +26,8 @@ SblOutputUngroupedFunction = Callable[
     [ScrumConfig, OutputConfig, Any, Collection], None
 ]
 """Function for outputting bare collection"""
+
+SblOutputStreamFunction = Callable[
+    [ScrumConfig, OutputConfig, Any, Iterable[Card]], None
+]
+"""Function for outputting cards as they're loaded"""
@@ -1,38 +1,64 @@
 """Display a collection of scrum cards"""
 
 import argparse
+from contextlib import closing
+import itertools
 
+from scrummd import daemon
 from scrummd.collection import (
+    Collection,
     Filter,
     Groups,
     SortCriteria,
-    get_collection,
+    load_collection_index,
     group_collection,
+    filter_cards,
     filter_collection,
+    iter_cards,
     sort_collection,
 )
-from scrummd.config_loader import load_fs_config
+from scrummd.config_loader import (
+    add_jobs_argument,
+    apply_arguments,
+    load_fs_config,
+    non_negative_int,
+)
 from scrummd.exceptions import ValidationError
-from scrummd.sbl import board_output, text_output
+from scrummd.sbl import board_output, csv_output, ndjson_output, text_output
 from scrummd.sbl.output import (
     OutputConfig,
     SblOutputGroupedFunction,
+    SblOutputStreamFunction,
     SblOutputUngroupedFunction,
 )
 from scrummd.version import version_to_output
 
 VALIDATION_ERROR = 1
-OUTPUT_FORMATS = ["text", "board"]
+OUTPUT_FORMATS = ["text", "board", "ndjson", "csv", "tsv"]
 
 UNGROUPED_OUTPUTTERS: dict[str, SblOutputUngroupedFunction] = {
     "text": text_output.text_ungrouped_output,
     "board": board_output.board_ungrouped_output,
+    "ndjson": ndjson_output.ndjson_ungrouped_output,
+    "csv": csv_output.csv_ungrouped_output,
+    "tsv": csv_output.tsv_ungrouped_output,
 }
 
 GROUPED_OUTPUTTERS: dict[str, SblOutputGroupedFunction] = {
     "text": text_output.text_grouped_output,
     "board": board_output.board_grouped_output,
+    "ndjson": ndjson_output.ndjson_grouped_output,
+    "csv": csv_output.csv_grouped_output,
+    "tsv": csv_output.tsv_grouped_output,
+}
+
+STREAM_OUTPUTTERS: dict[str, SblOutputStreamFunction] = {
+    "text": text_output.text_stream_output,
+    "ndjson": ndjson_output.ndjson_stream_output,
+    "csv": csv_output.csv_stream_output,
+    "tsv": csv_output.tsv_stream_output,
 }
+"""Outputters that can output cards as they're loaded, when they don't need sorting or grouping"""
 
 
 def include_to_filter(source: str) -> Filter:
@@ -74,6 +100,27 @@ def field_to_sort_criteria(argument: str) -> SortCriteria:
     return SortCriteria(stripped, False)
 
 
+def add_page_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the --limit and --offset arguments, to output only a page of the sorted cards
+
+    Args:
+        parser (argparse.ArgumentParser): Parser to add the arguments to
+    """
+    parser.add_argument(
+        "--limit",
+        type=non_negative_int,
+        metavar="N",
+        help="Only include the first N cards (after sorting by --sort-by).",
+    )
+    parser.add_argument(
+        "--offset",
+        type=non_negative_int,
+        default=0,
+        metavar="M",
+        help="Skip the first M cards (after sorting by --sort-by).",
+    )
+
+
 def create_parser() -> argparse.ArgumentParser:
     """Create an argument parser for sbl
 
@@ -134,10 +181,21 @@ def create_parser() -> argparse.ArgumentParser:
         + "of grouping. Can prefix field with ^ to reverse the sort.",
     )
 
+    parser.add_argument(
+        "-r",
+        "--referenced-by",
+        metavar="INDEX",
+        help="Only include cards that refer to the card with this index.",
+    )
+
+    add_page_arguments(parser)
+
     parser.add_argument(
         "-o", "--output", default="text", choices=OUTPUT_FORMATS, help="Output format"
     )
 
+    add_jobs_argument(parser)
+
     parser.add_argument(
         "--version",
         action="version",
@@ -149,16 +207,15 @@ def create_parser() -> argparse.ArgumentParser:
 
 def entry():
     """Entry point for sbl"""
+    remote_exit_code = daemon.try_remote("sbl")
+    if remote_exit_code is not None:
+        return remote_exit_code
+
     parser = create_parser()
     args = parser.parse_args()
 
     config = load_fs_config()
-
-    try:
-        collection = get_collection(config, args.collection)
-    except ValidationError:
-        if config.strict:
-            return VALIDATION_ERROR
+    apply_arguments(config, args)
 
     if args.columns:
         columns = [column.strip() for column in args.columns.split(",")]
@@ -171,16 +228,52 @@ def entry():
         columns = ["path"]
         omit_headers = True
 
+    group_by = args.group_by or config.sboard.default_group_by
+
+    if args.output in STREAM_OUTPUTTERS and not (
+        args.collection or args.referenced_by or args.sort_by or group_by
+    ):
+        # Nothing needs every card before output can start
+        with closing(iter_cards(config, lazy=True)) as all_cards:
+            try:
+                cards = filter_cards(all_cards, args.include or [])
+                end = None if args.limit is None else args.offset + args.limit
+                STREAM_OUTPUTTERS[args.output](
+                    config,
+                    OutputConfig(omit_headers, [], columns),
+                    None,
+                    itertools.islice(cards, args.offset, end),
+                )
+            except ValidationError:
+                if config.strict:
+                    return VALIDATION_ERROR
+        return
+
+    try:
+        collection_index = load_collection_index(config, args.collection, lazy=True)
+    except ValidationError:
+        if config.strict:
+            return VALIDATION_ERROR
+    collection = collection_index.get(args.collection)
+
+    if args.referenced_by:
+        collection = Collection(
+            (card_index, collection[card_index])
+            for card_index in collection_index.backlinks.get(args.referenced_by, [])
+            if card_index in collection
+        )
+
     if args.include:
-        collection = filter_collection(collection, args.include)
+        collection = filter_collection(collection, args.include, collection_index)
 
     output_specific_config = None
     if args.output == "board":
         output_specific_config = board_output.BoardConfig()
 
-    group_by = args.group_by or config.sboard.default_group_by
     if not group_by:
-        sorted_collection = sort_collection(collection, args.sort_by or [])
+        sorted_collection = sort_collection(
+            collection, args.sort_by or [], args.offset, args.limit
+        )
         UNGROUPED_OUTPUTTERS[args.output](
             config,
             OutputConfig(omit_headers, [], columns),
@@ -189,6 +282,10 @@ def entry():
         )
 
     else:
+        if args.offset or args.limit is not None:
+            collection = sort_collection(
+                collection, args.sort_by or [], args.offset, args.limit
+            )
         grouped = group_collection(config, collection, group_by, args.sort_by or [])
 
         GROUPED_OUTPUTTERS[args.output](
@@ -1,3 +1,5 @@
+from collections.abc import Iterable
+from scrummd.card import Card
 from scrummd.collection import Groups, Collection
 from scrummd.config import ScrumConfig
 from .output import OutputConfig
@@ -61,8 +63,25 @@ def text_ungrouped_output(
         text_config (None): Not used (yet)
         collection (Collection): Collection of cards to output
     """
+    text_stream_output(config, output_config, text_config, collection.values())
+
+
+def text_stream_output(
+    config: ScrumConfig,
+    output_config: OutputConfig,
+    text_config: None,
+    cards: Iterable[Card],
+) -> None:
+    """Output cards to stdout as they arrive
+
+    Args:
+        config (ScrumConfig): ScrumConfig
+        output_config (OutputConfig): Output specific config
+        text_config (None): Not used (yet)
+        cards (Iterable[Card]): Cards to output, such as from iter_cards
+    """
     if not output_config.omit_headers:
         print(", ".join(output_config.columns))
-    for card in collection.values():
+    for card in cards:
         values = [format_field(card.get_field(col)) for col in output_config.columns]
         print(", ".join(values))
@@ -2,13 +2,20 @@
 
 import sys
 import argparse
-from scrummd.collection import filter_collection, get_collection, group_collection
-from scrummd.config_loader import load_fs_config
+from scrummd import daemon
+from scrummd.collection import (
+    filter_collection,
+    group_collection,
+    load_collection_index,
+    sort_collection,
+)
+from scrummd.config_loader import add_jobs_argument, apply_arguments, load_fs_config
 from scrummd.exceptions import ValidationError
 import scrummd.sbl.board_output
 from scrummd.sbl.output import OutputConfig
 from scrummd.sbl.sbl import (
     VALIDATION_ERROR,
+    add_page_arguments,
     field_to_sort_criteria,
     include_to_filter,
 )
@@ -71,6 +78,8 @@ def create_parser() -> argparse.ArgumentParser:
         help="Sort by a field in card. Can use multiple sort-by arguments to have multiple levels "
         + "of grouping. Can prefix field with ^ to reverse the sort.",
     )
+    add_page_arguments(parser)
+    add_jobs_argument(parser)
     parser.add_argument(
         "--version",
         action="version",
@@ -82,16 +91,22 @@ def create_parser() -> argparse.ArgumentParser:
 
 def entry():
     """Entry point for sbl"""
+    remote_exit_code = daemon.try_remote("sboard")
+    if remote_exit_code is not None:
+        return remote_exit_code
+
     parser = create_parser()
     args = parser.parse_args()
 
     config = load_fs_config()
+    apply_arguments(config, args)
 
     try:
-        collection = get_collection(config, args.collection)
+        collection_index = load_collection_index(config, args.collection, lazy=True)
     except ValidationError:
         if config.strict:
             return VALIDATION_ERROR
+    collection = collection_index.get(args.collection)
 
     if args.columns:
         columns = [column.strip() for column in args.columns.split(",")]
@@ -99,7 +114,7 @@ def entry():
         columns = config.sbl.columns
 
     if args.include:
-        collection = filter_collection(collection, args.include)
+        collection = filter_collection(collection, args.include, collection_index)
 
     group_by = args.group_by or config.sboard.default_group_by
     if not group_by:
@@ -111,6 +126,10 @@ def entry():
 
     board_config = scrummd.sbl.board_output.BoardConfig()
 
+    if args.offset or args.limit is not None:
+        collection = sort_collection(
+            collection, args.sort_by or [], args.offset, args.limit
+        )
     grouped = group_collection(config, collection, group_by, args.sort_by or [])
     scrummd.sbl.board_output.board_grouped_output(
         config,
@@ -2,12 +2,14 @@
 
 import argparse
 import logging
+import sys
+from collections.abc import Iterator
 from typing import Optional
-from scrummd import formatter
+from scrummd import daemon, formatter
 from scrummd.card import Card
-from scrummd.collection import Collection, get_collection
+from scrummd.collection import Collection, load_collection_index
 from scrummd.config import ScrumConfig
-from scrummd.config_loader import load_fs_config
+from scrummd.config_loader import add_jobs_argument, apply_arguments, load_fs_config
 from scrummd.version import version_to_output
 from scrummd.source_md import (
     Field,
@@ -42,11 +44,25 @@ def format_field(value: Optional[Field]) -> str:
         raise TypeError(f"Unsupported type {type(value)}")
 
 
+OUTPUT_BUFFER_SIZE = 64 * 1024
+"""Characters of output to collect before writing them out (unless output is interactive)"""
+
+
+def _found_cards(collection: Collection, indexes: list[str]) -> Iterator[Card]:
+    """The cards with the indexes, logging any that aren't found"""
+    for card_index in indexes:
+        if card_index not in collection:
+            logger.error("Card %s not found", card_index)
+            continue
+        yield collection[card_index]
+
+
 def output_cards(
     config: ScrumConfig,
     template: str,
     collection: Collection,
     card_indexes: list[str] | str,
+    backlinks: Optional[dict[str, list[str]]] = None,
 ):
     """Output cards to stdout
 
@@ -54,15 +70,26 @@ def output_cards(
         config (ScrumConfig): Current configuration
         collection (Collection): Complete collection of cards
         card_index (list[str]): Indexes of cards to output
+        backlinks (Optional[dict[str, list[str]]], optional): Backlinks of the collection, if
+            they've already been found. Defaults to None (being found from the collection).
     """
     indexes = card_indexes if isinstance(card_indexes, list) else [card_indexes]
 
-    for card_index in indexes:
-        if card_index not in collection:
-            logger.error("Card %s not found", card_index)
-            continue
-        card = collection[card_index]
-        print(formatter.format(config, template, card, collection))
+    # Each card is written as soon as it's rendered to a terminal, but otherwise in chunks
+    buffer_size = 0 if sys.stdout.isatty() else OUTPUT_BUFFER_SIZE
+    buffered: list[str] = []
+    buffered_size = 0
+    for rendered in formatter.format_many(
+        config, template, _found_cards(collection, indexes), collection, backlinks
+    ):
+        buffered.append(rendered)
+        buffered.append("\n")
+        buffered_size += len(rendered) + 1
+        if buffered_size >= buffer_size:
+            sys.stdout.write("".join(buffered))
+            buffered.clear()
+            buffered_size = 0
+    sys.stdout.write("".join(buffered))
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -81,17 +108,30 @@ def create_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "-t", "--template", help="Template file to use", default="default_scard.j2"
     )
+    add_jobs_argument(parser)
     parser.description = __doc__
     return parser
 
 
 def entry(args=None, config=None):
     """Entry point for scard"""
+    if args is None and config is None:
+        remote_exit_code = daemon.try_remote("scard")
+        if remote_exit_code is not None:
+            return remote_exit_code
+
     args = create_parser().parse_args(args)
     config = config or load_fs_config()
-    collection = get_collection(config)
-
-    output_cards(config, args.template, collection, args.card)
+    apply_arguments(config, args)
+    collection_index = load_collection_index(config)
+
+    output_cards(
+        config,
+        args.template,
+        collection_index.get(),
+        args.card,
+        collection_index.backlinks,
+    )
 
 
 if __name__ == "__main__":
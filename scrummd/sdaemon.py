@@ -0,0 +1,69 @@
+"""Keep the cards of the scrum folder loaded in a local server, so that sbl, scard and sboard
+return faster. Those commands use the server automatically while it's running."""
+
+import argparse
+import logging
+import sys
+
+from scrummd import daemon
+from scrummd.config_loader import load_fs_config
+from scrummd.version import version_to_output
+
+logger = logging.getLogger(__name__)
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create an argument parser for sdaemon
+
+    Returns:
+        argparse.ArgumentParser: ArgumentParser for sdaemon
+    """
+    parser = argparse.ArgumentParser()
+    parser.description = __doc__
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument(
+        "--stop", action="store_true", help="Stop the running server and exit."
+    )
+    action.add_argument(
+        "--status",
+        action="store_true",
+        help="Exit with 0 if the server is running, or 1 if it's not.",
+    )
+    parser.add_argument(
+        "--version",
+        action="version",
+        version=version_to_output(),
+    )
+    return parser
+
+
+def entry() -> int:
+    """Entry point for sdaemon"""
+    args = create_parser().parse_args()
+    config = load_fs_config()
+
+    if not daemon.is_supported():
+        print("sdaemon requires Unix domain sockets.", file=sys.stderr)
+        return 1
+
+    if args.stop or args.status:
+        response = daemon.request(
+            config, {"command": "stop" if args.stop else "status"}
+        )
+        if response is None:
+            print("sdaemon is not running.", file=sys.stderr)
+            return 1
+        return 0
+
+    server = daemon.Server(config)
+    server.warm()
+    print(f"Listening on {daemon.socket_path(config)}", file=sys.stderr)
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(entry())
@@ -0,0 +1,70 @@
+"""Export a collection of scrum cards to a columnar snapshot, for analysis with scrummd.snapshot"""
+
+import argparse
+import pathlib
+import sys
+
+from scrummd.collection import get_collection
+from scrummd.config_loader import add_jobs_argument, apply_arguments, load_fs_config
+from scrummd.exceptions import ValidationError
+from scrummd.snapshot import write_snapshot
+from scrummd.version import version_to_output
+
+VALIDATION_ERROR = 1
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create an argument parser for sexport
+
+    Returns:
+        argparse.ArgumentParser: ArgumentParser for sexport
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "collection",
+        nargs="?",
+        help="The collection to export. If none is given, all cards are exported.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        metavar="FILE",
+        help="File to write the snapshot to. It's replaced if it already exists. It can't be "
+        + "in the scrum folder, as every file there is read as a card.",
+    )
+    add_jobs_argument(parser)
+    parser.add_argument(
+        "--version",
+        action="version",
+        version=version_to_output(),
+    )
+    parser.description = __doc__
+    return parser
+
+
+def entry():
+    """Entry point for sexport"""
+    parser = create_parser()
+    args = parser.parse_args()
+
+    config = load_fs_config()
+    apply_arguments(config, args)
+
+    output = pathlib.Path(args.output).resolve()
+    if output.is_relative_to(pathlib.Path(config.scrum_path).resolve()):
+        parser.error(
+            f"{args.output} is in the scrum folder, where it would be read as a card"
+        )
+
+    try:
+        collection = get_collection(config, args.collection)
+    except ValidationError as ex:
+        print(ex, file=sys.stderr)
+        return VALIDATION_ERROR
+
+    write_snapshot(collection, args.output)
+
+
+if __name__ == "__main__":
+    entry()
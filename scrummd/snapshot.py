@@ -0,0 +1,308 @@
+"""Columnar snapshots of a collection, for reading a few fields of every card without parsing them.
+
+A snapshot (written by ``sexport``) has a column for each field of the cards. The numbers in a
+column are stored as an array of floats, and its strings and lists as arrays of codes into a
+dictionary of the column's distinct strings - so loading a snapshot is an mmap, and aggregating a
+field is a scan over an array.
+
+The file is ``MAGIC``, the length of a JSON header, the header, and then the arrays, each aligned
+to 8 bytes, in the byte order of the machine that wrote them. The header has the amount of rows,
+and for each column its dictionary and where its arrays are.
+"""
+
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+import json
+import math
+import mmap
+import os
+import pathlib
+import struct
+import sys
+import tempfile
+from typing import Any, BinaryIO, Optional
+
+from scrummd.collection import Collection
+from scrummd.exceptions import InvalidSnapshotError
+from scrummd.source_md import Field, FieldNumber, FieldStr
+
+MAGIC = b"SMDSNAP\0"
+"""Start of every snapshot file"""
+
+SNAPSHOT_FORMAT = 1
+"""Bumped whenever the layout of the snapshot file changes"""
+
+MISSING = -1
+"""Code of a row that has no string in a column"""
+
+CARD_COLUMNS = ["index", "summary", "path"]
+"""Columns of every snapshot, ahead of the columns for the fields in the cards"""
+
+_HEADER_LENGTH = struct.Struct("<Q")
+_ALIGNMENT = 8
+
+_ARRAY_TYPES = {"numbers": "d", "codes": "i", "starts": "q", "items": "i"}
+"""Type code of each array a column can have"""
+
+
+@dataclass
+class Column:
+    """A field of every card in a snapshot
+
+    Each array is a memoryview of the mapped file, and is None if no card has a value of that
+    type in the field. A row is either a number (not NaN in numbers), a string (not MISSING in
+    codes), a list (a non-empty range of items between starts[row] and starts[row + 1]), or
+    missing. As they're views of the file, they can be handed to numpy.frombuffer as they are.
+    """
+
+    name: str
+    """Name of the field"""
+
+    dictionary: list[str]
+    """Every distinct string in the column, by its code"""
+
+    numbers: Optional[memoryview] = None
+    """Doubles - the value of each row that's a number, or NaN"""
+
+    codes: Optional[memoryview] = None
+    """Ints - the code of each row that's a string, or MISSING"""
+
+    starts: Optional[memoryview] = None
+    """Long longs - where the items of each row's list start in items (with one extra, the end)"""
+
+    items: Optional[memoryview] = None
+    """Ints - the codes of the items of every list, one row after the other"""
+
+    def value(self, row: int) -> Optional[Field]:
+        """Value of the field in a row, as it was in the card
+
+        Args:
+            row (int): Row of the card
+
+        Returns:
+            Optional[Field]: The field, or None if the card didn't have it
+        """
+        if self.numbers is not None and not math.isnan(self.numbers[row]):
+            return FieldNumber(self.numbers[row])
+        if self.codes is not None and self.codes[row] != MISSING:
+            return FieldStr(self.dictionary[self.codes[row]])
+        if self.starts is not None and self.starts[row] != self.starts[row + 1]:
+            assert self.items is not None
+            return [
+                FieldStr(self.dictionary[code])
+                for code in self.items[self.starts[row] : self.starts[row + 1]]
+            ]
+        return None
+
+    def total(self) -> float:
+        """Sum of the numbers in the column (ignoring anything that isn't a number)
+
+        Returns:
+            float: The sum
+        """
+        if self.numbers is None:
+            return 0.0
+        return math.fsum(number for number in self.numbers if number == number)
+
+    def counts(self) -> dict[str, int]:
+        """How many cards have each string in the column (ignoring numbers and lists)
+
+        Returns:
+            dict[str, int]: Count of each string, for those with at least one card
+        """
+        if self.codes is None:
+            return {}
+        counts = Counter(self.codes)
+        counts.pop(MISSING, None)
+        return {self.dictionary[code]: count for code, count in counts.items()}
+
+
+def _encode_column(
+    collection: Collection, name: str
+) -> tuple[list[str], dict[str, array]]:
+    """Build the dictionary and arrays of a column, leaving out arrays with nothing in them"""
+    dictionary: dict[str, int] = {}
+    arrays = {key: array(type_code) for key, type_code in _ARRAY_TYPES.items()}
+    numbers, codes, starts, items = (arrays[key] for key in _ARRAY_TYPES)
+    used = set()
+    starts.append(0)
+    for card in collection.values():
+        value = card.get_field(name)
+        numbers.append(math.nan)
+        codes.append(MISSING)
+        if isinstance(value, FieldNumber):
+            numbers[-1] = value
+            used.add("numbers")
+        elif isinstance(value, list):
+            items.extend(dictionary.setdefault(item, len(dictionary)) for item in value)
+            used.update(("starts", "items"))
+        elif value is not None:
+            codes[-1] = dictionary.setdefault(value, len(dictionary))
+            used.add("codes")
+        starts.append(len(items))
+    return list(dictionary), {key: arrays[key] for key in _ARRAY_TYPES if key in used}
+
+
+def _write_aligned(snapshot_file: BinaryIO, data: bytes | array) -> int:
+    """Write data after padding to the alignment, returning where it was written"""
+    position = snapshot_file.tell()
+    padding = -position % _ALIGNMENT
+    snapshot_file.write(b"\0" * padding)
+    snapshot_file.write(data)
+    return position + padding
+
+
+def write_snapshot(collection: Collection, path: str | pathlib.Path) -> None:
+    """Write a snapshot of a collection, with a row for each card in the order of the collection
+
+    Args:
+        collection (Collection): Cards to write
+        path (str | pathlib.Path): File to write the snapshot to. It's replaced if it exists.
+    """
+    names = dict.fromkeys(CARD_COLUMNS)
+    for card in collection.values():
+        names.update(dict.fromkeys(card.udf))
+    columns = {name: _encode_column(collection, name) for name in names}
+
+    # The arrays are laid out first so the header can say where they are
+    layout: list[dict[str, Any]] = []
+    position = 0
+    for name, (dictionary, arrays) in columns.items():
+        column: dict[str, Any] = {"name": name, "dictionary": dictionary}
+        for key, values in arrays.items():
+            position += -position % _ALIGNMENT
+            column[key] = [position, len(values)]
+            position += len(values) * values.itemsize
+        layout.append(column)
+    header = json.dumps(
+        {
+            "format": SNAPSHOT_FORMAT,
+            "byteorder": sys.byteorder,
+            "rows": len(collection),
+            "columns": layout,
+        }
+    ).encode()
+
+    path = pathlib.Path(path)
+    # A uniquely named file, so concurrent writers don't write over each other's
+    temp_fd, temp_path = tempfile.mkstemp(
+        dir=path.parent, prefix=path.name, suffix=".tmp"
+    )
+    try:
+        with os.fdopen(temp_fd, "wb") as snapshot_file:
+            snapshot_file.write(MAGIC + _HEADER_LENGTH.pack(len(header)) + header)
+            data_start = _write_aligned(snapshot_file, b"")
+            for column, (_, arrays) in zip(layout, columns.values()):
+                for key, values in arrays.items():
+                    position = _write_aligned(snapshot_file, values)
+                    assert position - data_start == column[key][0]
+        # Replace rather than write in place, so a snapshot being read is never half written
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class Snapshot:
+    """A snapshot file, mapped into memory
+
+    Close it (or use it as a context manager) to unmap the file. Any columns taken from it can't be
+    used once it's closed.
+    """
+
+    rows: int
+    """Amount of cards in the snapshot"""
+
+    columns: dict[str, Column]
+    """Every column in the snapshot, by the name of its field"""
+
+    def __init__(self, path: str | pathlib.Path) -> None:
+        """
+        Constructor for Snapshot.
+
+        Args:
+            path (str | pathlib.Path): Snapshot file, as written by write_snapshot.
+
+        Raises:
+            InvalidSnapshotError: The file isn't a snapshot, or was written by an incompatible
+                version or machine.
+        """
+        with open(path, "rb") as snapshot_file:
+            try:
+                self._mmap = mmap.mmap(
+                    snapshot_file.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            except ValueError:
+                raise InvalidSnapshotError(f"{path} is empty")
+        self._views: list[memoryview] = []
+        try:
+            self._load(path)
+        except Exception:
+            self.close()
+            raise
+
+    def _load(self, path: str | pathlib.Path) -> None:
+        """Read the header, and make views of the arrays of every column"""
+        prefix_length = len(MAGIC) + _HEADER_LENGTH.size
+        if self._mmap[: len(MAGIC)] != MAGIC or len(self._mmap) < prefix_length:
+            raise InvalidSnapshotError(f"{path} is not a snapshot")
+        (header_length,) = _HEADER_LENGTH.unpack_from(self._mmap, len(MAGIC))
+        try:
+            header = json.loads(
+                self._mmap[prefix_length : prefix_length + header_length]
+            )
+        except ValueError:
+            raise InvalidSnapshotError(f"{path} has a corrupt header")
+        if header.get("format") != SNAPSHOT_FORMAT:
+            raise InvalidSnapshotError(f"{path} is from an incompatible version")
+        if header.get("byteorder") != sys.byteorder:
+            raise InvalidSnapshotError(f"{path} was written with another byte order")
+
+        data_start = prefix_length + header_length
+        data_start += -data_start % _ALIGNMENT
+        whole = memoryview(self._mmap)
+        self._views.append(whole)
+
+        self.rows = header["rows"]
+        self.columns = {}
+        for layout in header["columns"]:
+            arrays = {}
+            for key, type_code in _ARRAY_TYPES.items():
+                if key not in layout:
+                    continue
+                offset, length = layout[key]
+                start = data_start + offset
+                end = start + length * struct.calcsize(type_code)
+                if end > len(self._mmap):
+                    raise InvalidSnapshotError(f"{path} is truncated")
+                view = whole[start:end].cast(type_code)
+                self._views.append(view)
+                arrays[key] = view
+            self.columns[layout["name"]] = Column(
+                layout["name"], layout["dictionary"], **arrays
+            )
+
+    def column(self, name: str) -> Column:
+        """Get the column of a field
+
+        Args:
+            name (str): Name of the field
+
+        Returns:
+            Column: The column. If no card has the field, a column with no arrays.
+        """
+        return self.columns.get(name, Column(name, []))
+
+    def close(self) -> None:
+        """Unmap the file"""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
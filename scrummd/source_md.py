@@ -1,11 +1,14 @@
 from dataclasses import dataclass
 import re
 import itertools
-from copy import deepcopy
 from enum import Enum
 from typing import Optional, TYPE_CHECKING, Union, cast
-from collections.abc import ItemsView, KeysView
+from collections.abc import ItemsView, Iterator, KeysView
+import locale
 import logging
+import mmap
+import sys
+import weakref
 
 from scrummd.config import ScrumConfig
 from scrummd.exceptions import (
@@ -60,8 +63,10 @@ GroupedKeys = list[tuple[FIELD_GROUP_TYPE, list[str]]]
 class FieldComponent:
     """A section of the field component"""
 
+    __slots__ = ()
 
-@dataclass
+
+@dataclass(slots=True)
 class CardComponent(FieldComponent):
     """A component of the field that refers to a card"""
 
@@ -76,21 +81,21 @@ class CardComponent(FieldComponent):
             logger.warning(f"Card index {self.card_index} referred to but not found.")
 
 
-@dataclass
+@dataclass(slots=True)
 class StringComponent(FieldComponent):
     """A component of the field that is just a string."""
 
     value: str
 
 
-@dataclass
+@dataclass(slots=True)
 class CodeBlockComponent(FieldComponent):
     """A component that is a block of pre-formatted code."""
 
     value: str
 
 
-@dataclass
+@dataclass(slots=True)
 class CodeQuoteComponent(FieldComponent):
     """A component that is a small piece of pre-formatted code as part of another line."""
 
@@ -109,21 +114,36 @@ _extract_collection_re = re.compile(r"\[\[([^!][^\]\n]*)\]\]")
 _extract_card_component_re = re.compile(r"\[\[[!]*([^\]\n]*)\]\]")
 """Regex expression used to extract the [[cardindexes]] out of a field to store in the field, including [[!]] cards"""
 
-_extract_header_level_re = re.compile(r"^#*")
-"""Regex expression used to extract the amount of #'s"""
+_raw_block_name_re = re.compile(r"\#+(.*)")
+"""Regex to get the name of a header"""
+
+_split_property_re = re.compile(r"\W*([^\:]+)\:(.*)")
+"""Regex to split a property line into its key and value"""
+
+_property_block_marker_re = re.compile(r"^[ \t]*---[ \t]*\r?$", re.MULTILINE)
+"""Regex to find a line that starts or ends a property block"""
+
+_NOT_LAZY_MARKERS = ("[[", "---", "===")
+"""Text after the leading property block that means a card can't be lazily extracted - card
+references, more property blocks and underlined headers"""
+
+_property_block_marker_bytes_re = re.compile(
+    _property_block_marker_re.pattern.encode(), re.MULTILINE
+)
+_NOT_LAZY_MARKER_BYTES = tuple(marker.encode() for marker in _NOT_LAZY_MARKERS)
+"""Versions of the above for finding in the undecoded bytes of a file"""
 
-_extract_octothorpless_header_re = re.compile("^#*(.*)")
-"""Regex to get the bits without #"""
+_NOT_LAZY_FIELDS = {"summary", "index", "tags", "collections", "items"}
+"""Fields that are always needed to create a card, so can't be deferred"""
 
 
 class FieldStr(str):
     """A str with the extra parsed information from the str"""
 
-    _components: Optional[list[FieldComponent]]
-
-    def __init__(self, value):
-        super().__init__()
-        self._components = None
+    # str subclasses can't have slots. Defaulting on the class means there's no per-instance
+    # __dict__ until the components are worked out. The collection they were worked out against
+    # is kept (weakly) with them, because the cards referenced are looked up in it.
+    _components: Optional[tuple["weakref.ref[Collection]", list[FieldComponent]]] = None
 
     def components(self, collection: "Collection") -> list[FieldComponent]:
         """Break the field string into its components. This can be used for when the card is outputted to - for instance - format the strings.
@@ -132,9 +152,11 @@ class FieldStr(str):
             list[FieldComponent]: All the components of the str.
         """
 
-        # Caching in case used again. Only need to do once, because strings are immutable.
-        if self._components:
-            return self._components
+        # Caching in case used again. Only need to do once per collection, because strings are
+        # immutable - but a card kept between collections (such as by the daemon) may reference
+        # cards that have since been added or removed.
+        if self._components and self._components[0]() is collection:
+            return self._components[1]
 
         # Doing multiple passes here:
         #  - Extract the ``` code blocks
@@ -143,7 +165,7 @@ class FieldStr(str):
         # Doing multiple passes, because regex isn't great at ignoring things between delimiters
         # (even if it's possible) and the re strings were getting unweildy (and undebuggable).
 
-        self._components = [
+        components = [
             output_component
             for input_component in self._extract_code_components()
             for output_component in (
@@ -152,7 +174,16 @@ class FieldStr(str):
                 else cast(list[FieldComponent], [input_component])
             )
         ]
-        return self._components
+        try:
+            self._components = (weakref.ref(collection), components)
+        except TypeError:
+            # A plain dict (rather than a Collection) can't be weakly referenced, so isn't cached
+            pass
+        return components
+
+    def __reduce__(self):
+        # The components reference other cards, so are left out when pickled into the cache
+        return (FieldStr, (str(self),))
 
     def _extract_code_components(
         self,
@@ -293,14 +324,14 @@ class FieldStr(str):
 class FieldNumber(float, FieldComponent):
     """A float with the extra parsed information"""
 
-    pass
+    __slots__ = ()
 
 
 Field = FieldStr | list[FieldStr] | FieldNumber
 """A field from the md file"""
 
 
-@dataclass
+@dataclass(slots=True)
 class FieldMetadata:
     """Metadata for a field
 
@@ -317,9 +348,29 @@ class FieldMetadata:
     """The amount of #'s (or lines under) of the header"""
 
 
+@dataclass(frozen=True)
+class DeferredFile:
+    """A card file to read again when its deferred fields are needed, rather than holding on to its
+    contents"""
+
+    path: str
+    """Path of the card file"""
+
+    def read(self) -> str:
+        """Read the contents of the file
+
+        Returns:
+            str: The contents
+        """
+        with open(self.path, "r") as fo:
+            return fo.read()
+
+
 class ParsedMd:
     """A dictionary of the MD with additional metadata from the md file"""
 
+    __slots__ = ("_fields", "_meta", "_order", "_deferred", "_deferred_keys")
+
     def __init__(self) -> None:
         """
         Constructor for ParsedMd.
@@ -329,6 +380,37 @@ class ParsedMd:
         self._fields: dict[str, Field] = {}
         self._meta: dict[str, FieldMetadata] = {}
         self._order: list[str] = []
+        self._deferred: Optional[str | DeferredFile] = None
+        self._deferred_keys: frozenset[str] = frozenset()
+
+    @property
+    def is_lazy(self) -> bool:
+        """Whether the fields after the leading property block are yet to be extracted"""
+        return self._deferred is not None
+
+    @property
+    def deferred_keys(self) -> frozenset[str]:
+        """Keys of the header fields that are yet to be extracted (empty unless it's lazy)"""
+        return self._deferred_keys
+
+    def resolve(self, config: ScrumConfig) -> None:
+        """
+        Extract any fields that were deferred by a lazy extract_fields.
+
+        Args:
+            config (ScrumConfig): ScrumMD configuration the fields were extracted with.
+        """
+        if self._deferred is None:
+            return
+        md_file = self._deferred
+        if isinstance(md_file, DeferredFile):
+            md_file = md_file.read()
+        resolved = extract_fields(config, md_file)
+        self._fields = resolved._fields
+        self._meta = resolved._meta
+        self._order = resolved._order
+        self._deferred = None
+        self._deferred_keys = frozenset()
 
     def __getitem__(self, key: str) -> Field:
         """
@@ -386,11 +468,22 @@ class ParsedMd:
         """
         Creates a new ParsedMd with the same fields and metadata.
 
+        The copy shares the field values and metadata with the original - so they're replaced
+        rather than modified when changing a ParsedMd (as set_fields, add_to_list and
+        remove_from_list do). Only the containers holding them are copied. A lazy copy shares the
+        deferred fields too, which is only safe until it's changed - so those methods resolve the
+        fields before copying.
+
         Returns:
             ParsedMd: A new ParsedMd with the same fields and metadata.
         """
-        # TBD if this is fast enough or overkill
-        return deepcopy(self)
+        new_md = ParsedMd()
+        new_md._fields = dict(self._fields)
+        new_md._meta = dict(self._meta)
+        new_md._order = list(self._order)
+        new_md._deferred = self._deferred
+        new_md._deferred_keys = self._deferred_keys
+        return new_md
 
     def keys(self) -> KeysView[str]:
         """
@@ -412,9 +505,10 @@ class ParsedMd:
             value (Field): The value of the field to add.
             md_type (FIELD_MD_TYPE): The type of the field in the md file.
         """
-        key = raw_key.casefold()
+        # Interned, as the same few field names are used by every card
+        key = sys.intern(raw_key.casefold())
         self._fields[key] = value
-        self._meta[key] = FieldMetadata(md_type, raw_key, header_level)
+        self._meta[key] = FieldMetadata(md_type, sys.intern(raw_key), header_level)
         self._order.append(key)
 
     def insert_field(
@@ -434,9 +528,10 @@ class ParsedMd:
             md_type (FIELD_MD_TYPE): The type of the field in the md file.
             index (int): The index to insert the field at.
         """
-        key = raw_key.casefold()
+        # Interned, as the same few field names are used by every card
+        key = sys.intern(raw_key.casefold())
         self._fields[key] = value
-        self._meta[key] = FieldMetadata(md_type, raw_key, header_level)
+        self._meta[key] = FieldMetadata(md_type, sys.intern(raw_key), header_level)
         self._order.insert(index, key)
 
     def remove_field(self, key: str) -> None:
@@ -483,9 +578,12 @@ class ParsedMd:
             fields_to_set (list[tuple[str, str]]): Fields to set or create.
                 Each change is in the form of (FieldToChange, ValueToSetItTo).
         """
+        # The deferred fields are parsed from the file as it was, so they have to be parsed
+        # before changing any fields - otherwise resolving would undo the change
+        self.resolve(config)
         new_md = self.copy()
         for raw_key, new_value in fields_to_set:
-            key = raw_key.casefold()
+            key = sys.intern(raw_key.casefold())
             if key == "index":
                 raise UnsupportedModificationError(
                     "Index can not be modified inside ScrumMD"
@@ -540,8 +638,9 @@ class ParsedMd:
             NotAListError: Raised when the field to be written to is not a list.
             FieldNotPresentError: Raised when the field is not present in the file.
         """
-        # Need a deepcopy, because we're modifying (not replacing) child objects.
-        new_md = deepcopy(self)
+        # The deferred fields are parsed from the file as it was, so they have to be parsed
+        # before changing any fields - otherwise resolving would undo the change
+        self.resolve(config)
         key = field.casefold()
         if key not in self._fields:
             raise FieldNotPresentError(field)
@@ -551,12 +650,12 @@ class ParsedMd:
         if meta.md_type not in (FIELD_MD_TYPE.LIST_HEADER, FIELD_MD_TYPE.LIST_PROPERTY):
             raise NotAListError(field)
 
-        field_list = new_md._fields.get(key)
-        assert field_list
+        field_list = self._fields.get(key)
         assert isinstance(field_list, list)
 
-        for value in values:
-            field_list.append(FieldStr(value.strip()))
+        # Only the list being changed is copied - the rest is shared with this ParsedMd
+        new_md = self.copy()
+        new_md._fields[key] = field_list + [FieldStr(value.strip()) for value in values]
 
         return new_md
 
@@ -578,9 +677,10 @@ class ParsedMd:
             FieldNotPresentError: Raised when the field is not present in the file.
             ValuesNotPresentError: Raised when the value is not present in the list to remove.
         """
+        # The deferred fields are parsed from the file as it was, so they have to be parsed
+        # before changing any fields - otherwise resolving would undo the change
+        self.resolve(config)
 
-        # Need a deepcopy, because we're modifying (not replacing) child objects.
-        new_md = deepcopy(self)
         key = field.casefold()
         if key not in self._fields:
             raise FieldNotPresentError(field)
@@ -590,9 +690,13 @@ class ParsedMd:
         if meta.md_type not in (FIELD_MD_TYPE.LIST_HEADER, FIELD_MD_TYPE.LIST_PROPERTY):
             raise NotAListError(field)
 
-        field_list = new_md._fields.get(key)
-        assert field_list
-        assert isinstance(field_list, list)
+        original_list = self._fields.get(key)
+        assert isinstance(original_list, list)
+
+        # Only the list being changed is copied - the rest is shared with this ParsedMd
+        new_md = self.copy()
+        field_list = list(original_list)
+        new_md._fields[key] = field_list
 
         prepped_values = [value.strip().casefold() for value in values]
         logger.info("before {}", prepped_values)
@@ -666,7 +770,7 @@ def get_raw_block_name(md_line: str) -> str:
     Returns
         str: Text of header
     """
-    results = re.match(r"\#+(.*)", md_line)
+    results = _raw_block_name_re.match(md_line)
     if results is not None:
         return results.group(1).strip()
     else:
@@ -682,7 +786,7 @@ def split_property(md_line: str) -> tuple[str, str]:
     Returns:
         tuple(str, str): Key and value
     """
-    results = re.match(r"\W*([^\:]+)\:(.*)", md_line)
+    results = _split_property_re.match(md_line)
     if results is not None:
         return (results.group(1).strip(), results.group(2).strip())
     else:
@@ -744,7 +848,143 @@ def typed_field(field: str) -> Field:
         return FieldStr(field)
 
 
-def extract_fields(config: ScrumConfig, md_file: str) -> ParsedMd:
+class _BlockStatus(Enum):
+    """Type of block that extract_fields is in"""
+
+    NO_BLOCK = 0
+    IN_PROPERTY_BLOCK = 1
+    IN_HEADER_BLOCK = 2
+    IN_PROPERTY_LIST = 3
+    IN_HEADER_LIST = 4
+    IN_CODE_BLOCK = 5
+
+
+class _LineType(Enum):
+    """Type of a (non-blank) line, as far as extract_fields is concerned"""
+
+    TEXT = 0
+    PROPERTY_MARKER = 1
+    HEADER = 2
+    UNDERLINE = 3
+    LIST_ITEM = 4
+
+
+def _lazy_split(
+    config: ScrumConfig, md_file: str | bytes | mmap.mmap
+) -> Optional[tuple[int, frozenset[str]]]:
+    """Where the leading property block of md_file ends, if the rest can be extracted later
+
+    The rest can be deferred if it only has header fields that make no difference to creating
+    and validating the card.
+
+    Args:
+        config (ScrumConfig): ScrumMD configuration
+        md_file (str | bytes | mmap.mmap): Contents of the file - either decoded, or its bytes
+            (which are searched without decoding them)
+
+    Returns:
+        Optional[tuple[int, frozenset[str]]]: Offset of the end of the leading property block, and
+            the keys of the header fields after it - or None if everything needs extracting now
+    """
+    if isinstance(md_file, str):
+        marker_re, markers = _property_block_marker_re, _NOT_LAZY_MARKERS
+    else:
+        marker_re, markers = _property_block_marker_bytes_re, _NOT_LAZY_MARKER_BYTES
+
+    opening = marker_re.search(md_file)
+    if opening is None or md_file[: opening.start()].strip():
+        return None
+    closing = marker_re.search(md_file, opening.end())
+    if closing is None:
+        return None
+
+    split = closing.end()
+    if any(md_file.find(marker, split) != -1 for marker in markers):  # type: ignore[arg-type]
+        return None
+
+    needed = set(_NOT_LAZY_FIELDS)
+    needed.update(key.casefold() for key in config.required)
+    needed.update(key.casefold() for key in config.fields)
+    for collection_config in config.collections.values():
+        if not isinstance(collection_config, dict):
+            needed.update(key.casefold() for key in collection_config.required)
+            needed.update(key.casefold() for key in collection_config.fields)
+
+    deferred_keys = frozenset(_header_names(md_file, split))
+    if deferred_keys & needed:
+        return None
+    return split, deferred_keys
+
+
+def _header_names(md_file: str | bytes | mmap.mmap, start: int) -> Iterator[str]:
+    """The names of the # headers after start, stripped and casefolded
+
+    Found by jumping between #'s rather than matching every line, so long stretches of text without
+    any headers (such as pasted logs) are skipped quickly.
+    """
+    if isinstance(md_file, str):
+        hash_mark, newline, indent = "#", "\n", " \t"
+    else:
+        hash_mark, newline, indent = b"#", b"\n", b" \t"
+
+    position = md_file.find(hash_mark, start)  # type: ignore[arg-type]
+    while position != -1:
+        line_start = md_file.rfind(newline, 0, position) + 1  # type: ignore[arg-type]
+        line_end = md_file.find(newline, position)  # type: ignore[arg-type]
+        if line_end == -1:
+            line_end = len(md_file)
+        if not md_file[line_start:position].strip(indent):  # type: ignore[arg-type]
+            name = md_file[position:line_end].lstrip(hash_mark)  # type: ignore[arg-type]
+            if isinstance(name, bytes):
+                name = name.decode(errors="replace")
+            yield name.strip().casefold()
+        position = md_file.find(hash_mark, line_end)  # type: ignore[arg-type]
+
+
+def _decode(md_file: bytes) -> str:
+    """Decode the bytes of a card file as reading it in text mode would, newlines and all"""
+    text = md_file.decode(locale.getpreferredencoding(False))
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def extract_mapped_fields(
+    config: ScrumConfig,
+    md_file: bytes | mmap.mmap,
+    path: str,
+    lazy: bool = False,
+) -> ParsedMd:
+    """Extract all fields from the bytes of a card file, such as a memory mapped file
+
+    The same as decoding the file and using extract_fields, except that when lazy, only the leading
+    property block is decoded. If the rest can be deferred, it's not kept; the file is read again
+    if the deferred fields are needed.
+
+    Args:
+        config (ScrumConfig): ScrumMD configuration
+        md_file (bytes | mmap.mmap): Contents of the card file
+        path (str): Path of the card file
+        lazy (bool, optional): Defer extracting what's after the leading property block, where
+            possible. Defaults to False.
+
+    Returns:
+        ParsedMd: The fields of the card
+    """
+    if lazy:
+        lazy_split = _lazy_split(config, md_file)
+        if lazy_split is not None:
+            split, deferred_keys = lazy_split
+            parsed = extract_fields(config, _decode(md_file[:split]))
+            # A header repeating a property would replace it, so it can't be deferred
+            if "summary" in parsed and deferred_keys.isdisjoint(parsed.keys()):
+                if md_file.find(b"#", split) != -1:
+                    parsed._deferred = DeferredFile(path)
+                    parsed._deferred_keys = deferred_keys
+                return parsed
+
+    return extract_fields(config, _decode(md_file[:]))
+
+
+def extract_fields(config: ScrumConfig, md_file: str, lazy: bool = False) -> ParsedMd:
     """Extract all fields from the md_file
 
     There are two types of fields:
@@ -759,51 +999,103 @@ def extract_fields(config: ScrumConfig, md_file: str) -> ParsedMd:
 
     All keys are case insensitive and made lowercase.
 
+    If lazy, and nothing after the leading property block is needed to create and validate the
+    card, only the leading property block is extracted. The rest is extracted by
+    ParsedMd.resolve.
+
     Args:
         md_file (str): Contents of file to get data out of
+        lazy (bool, optional): Defer extracting what's after the leading property block, where
+            possible. Defaults to False.
 
     Returns:
         dict[str, Field]: a dictionary of all field names and values
     """
 
-    parsed: ParsedMd = ParsedMd()
-
-    class BlockStatus(Enum):
-        NO_BLOCK = 0
-        IN_PROPERTY_BLOCK = 1
-        IN_HEADER_BLOCK = 2
-        IN_PROPERTY_LIST = 3
-        IN_HEADER_LIST = 4
-        IN_CODE_BLOCK = 5
+    if lazy:
+        lazy_split = _lazy_split(config, md_file)
+        if lazy_split is not None:
+            split, deferred_keys = lazy_split
+            parsed = extract_fields(config, md_file[:split])
+            # A header repeating a property would replace it, so it can't be deferred
+            if "summary" in parsed and deferred_keys.isdisjoint(parsed.keys()):
+                if "#" in md_file[split:]:
+                    parsed._deferred = md_file
+                    parsed._deferred_keys = deferred_keys
+                return parsed
+
+    parsed = ParsedMd()
+
+    # Looked up once, rather than on every line
+    NO_BLOCK = _BlockStatus.NO_BLOCK
+    IN_PROPERTY_BLOCK = _BlockStatus.IN_PROPERTY_BLOCK
+    IN_HEADER_BLOCK = _BlockStatus.IN_HEADER_BLOCK
+    IN_PROPERTY_LIST = _BlockStatus.IN_PROPERTY_LIST
+    IN_HEADER_LIST = _BlockStatus.IN_HEADER_LIST
+    IN_CODE_BLOCK = _BlockStatus.IN_CODE_BLOCK
+    TEXT = _LineType.TEXT
+    PROPERTY_MARKER = _LineType.PROPERTY_MARKER
+    HEADER = _LineType.HEADER
+    UNDERLINE = _LineType.UNDERLINE
+    LIST_ITEM = _LineType.LIST_ITEM
 
     block_name: Optional[str] = None
-    block_status = BlockStatus.NO_BLOCK
+    block_status = NO_BLOCK
     block_value = ""
+    # Whether block_value is only whitespace - saves stripping it to check
+    block_blank = True
     list_field_key = ""
     raw_block_name = ""
     header_level = 0
 
+    # For the implicit summary; the text of each line without the leading #'s, by its casefolded
+    # version, as first seen
+    first_seen: Optional[dict[str, str]] = {} if config.allow_header_summary else None
+
     for line in md_file.splitlines():
+        if first_seen is not None:
+            octothorpless = line.lstrip("#")
+            first_seen.setdefault(octothorpless.casefold().strip(), octothorpless)
+
         stripped_line = line.strip()
-        if len(stripped_line) == 0:
+        if not stripped_line:
             block_value += "\n"
             continue
 
-        if block_status == BlockStatus.NO_BLOCK:
+        # Tokenize the line once, rather than testing it again in each state
+        first_char = stripped_line[0]
+        if first_char == "#":
+            line_type = HEADER
+        elif first_char == "-":
             if stripped_line == "---":
-                block_status = BlockStatus.IN_PROPERTY_BLOCK
+                line_type = PROPERTY_MARKER
+            elif stripped_line.startswith("----"):
+                line_type = UNDERLINE
+            else:
+                line_type = LIST_ITEM
+        elif first_char == "=" and stripped_line.startswith("===="):
+            line_type = UNDERLINE
+        else:
+            line_type = TEXT
+        # "----" underlines are list items too, where a list is expected
+        is_list_item = line_type == LIST_ITEM or (
+            line_type == UNDERLINE and first_char == "-"
+        )
+
+        if block_status == NO_BLOCK:
+            if line_type == PROPERTY_MARKER:
+                block_status = IN_PROPERTY_BLOCK
                 continue
-            elif stripped_line[0] == "#":
-                raw_block_name = get_raw_block_name(stripped_line)
+            elif line_type == HEADER:
+                header_name = stripped_line.lstrip("#")
+                header_level = len(stripped_line) - len(header_name)
+                raw_block_name = header_name.strip()
                 block_name = raw_block_name
                 block_value = ""
-                block_status = BlockStatus.IN_HEADER_BLOCK
-                starting_hashes = _extract_header_level_re.match(stripped_line)
-                assert starting_hashes
-                header_level = len(starting_hashes[0])
-                assert header_level > 0
+                block_blank = True
+                block_status = IN_HEADER_BLOCK
                 continue
-            elif stripped_line.startswith("====") or stripped_line.startswith("----"):
+            elif line_type == UNDERLINE:
                 # Currently, ==== and ---- are conflated, but they may become
                 # first and second level headers respectively
                 block_value_lines = block_value.splitlines()
@@ -811,32 +1103,33 @@ def extract_fields(config: ScrumConfig, md_file: str) -> ParsedMd:
                     raw_block_name = block_value_lines[-1].strip()
                     block_name = (block_value_lines[-1]).casefold()
                     block_value = ""
-                    header_level = 1 if stripped_line[0] == "=" else 2
-                    block_status = BlockStatus.IN_HEADER_BLOCK
-                    continue
+                    block_blank = True
+                    header_level = 1 if first_char == "=" else 2
+                    block_status = IN_HEADER_BLOCK
+                continue
             else:
                 block_value += line
+                block_blank = False
                 continue
 
-        if block_status == BlockStatus.IN_PROPERTY_LIST:
-            if stripped_line[0] == "-" and stripped_line != "---":
-                value = split_list_item(stripped_line)
+        if block_status == IN_PROPERTY_LIST:
+            if is_list_item:
                 field_list = parsed[list_field_key]
                 assert isinstance(field_list, list)
-                field_list.append(FieldStr(value))
+                field_list.append(FieldStr(split_list_item(stripped_line)))
                 continue
             else:
-                block_status = BlockStatus.IN_PROPERTY_BLOCK
+                block_status = IN_PROPERTY_BLOCK
 
-        if block_status == BlockStatus.IN_PROPERTY_BLOCK:
-            if stripped_line == "---":
-                block_status = BlockStatus.NO_BLOCK
+        if block_status == IN_PROPERTY_BLOCK:
+            if line_type == PROPERTY_MARKER:
+                block_status = NO_BLOCK
                 continue
             if ":" not in stripped_line:
                 raise InvalidFileError("Invalid property line %s", stripped_line)
             raw_list_field_key, value = split_property(stripped_line)
             if value == "":
-                block_status = BlockStatus.IN_PROPERTY_LIST
+                block_status = IN_PROPERTY_LIST
                 list_field_key = raw_list_field_key.casefold()
                 parsed.append_field(
                     raw_list_field_key, [], FIELD_MD_TYPE.LIST_PROPERTY, 0
@@ -847,86 +1140,85 @@ def extract_fields(config: ScrumConfig, md_file: str) -> ParsedMd:
                 )
             continue
 
-        if block_status == BlockStatus.IN_HEADER_LIST:
-            if stripped_line[0] == "-" and stripped_line != "---":
-                value = split_list_item(stripped_line)
+        if block_status == IN_HEADER_LIST:
+            if is_list_item:
                 field_list = parsed[list_field_key]
                 assert isinstance(field_list, list)
-                field_list.append(FieldStr(value))
+                field_list.append(FieldStr(split_list_item(stripped_line)))
                 continue
             else:
                 block_name = None
-                block_status = BlockStatus.IN_HEADER_BLOCK
+                block_status = IN_HEADER_BLOCK
 
-        if block_status == BlockStatus.IN_CODE_BLOCK:
+        if block_status == IN_CODE_BLOCK:
             if "```" in stripped_line:
-                block_status = BlockStatus.IN_HEADER_BLOCK
+                block_status = IN_HEADER_BLOCK
             block_value += line + "\n"
+            block_blank = False
             continue
 
-        if block_status == BlockStatus.IN_HEADER_BLOCK:
-            if stripped_line == "---":
-                block_status = BlockStatus.IN_PROPERTY_BLOCK
-                if block_name is not None:
-                    parsed.append_field(
-                        raw_block_name,
-                        FieldStr(block_value.strip()),
-                        FIELD_MD_TYPE.BLOCK,
-                        header_level,
-                    )
-                block_value = ""
-                continue
-            elif stripped_line.startswith("====") or stripped_line.startswith("----"):
-                # Currently, ==== and ---- are conflated, but they may become
-                # first and second level headers respectively
-                block_value_lines = block_value.splitlines()
-                if block_name is not None:
-                    if len(block_value_lines) > 1:
-                        parsed.append_field(
-                            raw_block_name,
-                            typed_field("\n".join(block_value_lines[0:-1]).strip()),
-                            FIELD_MD_TYPE.BLOCK,
-                            header_level,
-                        )
+        # Only in a header block from here
+        if line_type == PROPERTY_MARKER:
+            block_status = IN_PROPERTY_BLOCK
+            if block_name is not None:
+                parsed.append_field(
+                    raw_block_name,
+                    FieldStr(block_value.strip()),
+                    FIELD_MD_TYPE.BLOCK,
+                    header_level,
+                )
+            block_value = ""
+            block_blank = True
+        elif line_type == UNDERLINE:
+            # Currently, ==== and ---- are conflated, but they may become
+            # first and second level headers respectively
+            block_value_lines = block_value.splitlines()
+            if block_name is not None:
                 if len(block_value_lines) > 1:
-                    raw_block_name = (block_value_lines[-1]).strip()
-                    block_name = raw_block_name.casefold()
-                    header_level = 1 if stripped_line[0] == "=" else 2
-                block_value = ""
-            elif stripped_line[0] == "#":
-                block_status = BlockStatus.IN_HEADER_BLOCK
-                if block_name is not None:
-                    assert header_level > 0
                     parsed.append_field(
                         raw_block_name,
-                        typed_field(block_value.strip()),
+                        typed_field("\n".join(block_value_lines[0:-1]).strip()),
                         FIELD_MD_TYPE.BLOCK,
                         header_level,
                     )
-                raw_block_name = get_raw_block_name(stripped_line)
-                starting_hashes = _extract_header_level_re.match(stripped_line)
-                assert starting_hashes
-                header_level = len(starting_hashes[0])
+            if len(block_value_lines) > 1:
+                raw_block_name = (block_value_lines[-1]).strip()
                 block_name = raw_block_name.casefold()
-                block_value = ""
-                continue
-            elif stripped_line[0] == "-" and block_value.strip() == "":
-                block_status = BlockStatus.IN_HEADER_LIST
-                if raw_block_name is not None:
-                    list_field_key = raw_block_name.casefold()
+                header_level = 1 if first_char == "=" else 2
+            block_value = ""
+            block_blank = True
+        elif line_type == HEADER:
+            if block_name is not None:
+                assert header_level > 0
                 parsed.append_field(
                     raw_block_name,
-                    [FieldStr(split_list_item(stripped_line))],
-                    FIELD_MD_TYPE.LIST_HEADER,
+                    typed_field(block_value.strip()),
+                    FIELD_MD_TYPE.BLOCK,
                     header_level,
                 )
-            elif "```" in stripped_line:
-                block_status = BlockStatus.IN_CODE_BLOCK
-                block_value += line + "\n"
-            else:
-                block_value += line + "\n"
+            header_name = stripped_line.lstrip("#")
+            header_level = len(stripped_line) - len(header_name)
+            raw_block_name = header_name.strip()
+            block_name = raw_block_name.casefold()
+            block_value = ""
+            block_blank = True
+        elif line_type == LIST_ITEM and block_blank:
+            block_status = IN_HEADER_LIST
+            if raw_block_name is not None:
+                list_field_key = raw_block_name.casefold()
+            parsed.append_field(
+                raw_block_name,
+                [FieldStr(split_list_item(stripped_line))],
+                FIELD_MD_TYPE.LIST_HEADER,
+                header_level,
+            )
+        else:
+            if "```" in stripped_line:
+                block_status = IN_CODE_BLOCK
+            block_value += line + "\n"
+            block_blank = False
 
-    if block_status == BlockStatus.IN_HEADER_BLOCK:
+    if block_status == IN_HEADER_BLOCK:
         if block_name is not None:
             parsed.append_field(
                 raw_block_name,
@@ -935,7 +1227,7 @@ def extract_fields(config: ScrumConfig, md_file: str) -> ParsedMd:
                 header_level,
             )
 
-    if config.allow_header_summary and "summary" not in parsed:
+    if first_seen is not None and "summary" not in parsed:
         possible_headers: list[str] = [
             key
             for key, value in parsed.items()
@@ -943,25 +1235,18 @@ def extract_fields(config: ScrumConfig, md_file: str) -> ParsedMd:
         ]
         if len(possible_headers) == 1:
             header_key = possible_headers[0]
-            # Need to get the actual casing of the summary -
-            # the summary has been CaseFold. By doing a second pass
-            # we can reduce the complexity of holding the data in
-            # the algorithm proper
-            for line in md_file.splitlines():
-                summary_text_matches = _extract_octothorpless_header_re.search(line)
-                assert summary_text_matches is not None
-                content_text = summary_text_matches[1].casefold().strip()
-                if content_text == header_key:
-                    previous_position = parsed.order().index(header_key)
-                    summary_text = _extract_octothorpless_header_re.search(line)
-                    parsed.insert_field(
-                        "Summary",
-                        FieldStr(summary_text_matches[1].strip()),
-                        FIELD_MD_TYPE.IMPLICIT_SUMMARY,
-                        previous_position,
-                    )
-                    parsed.remove_field(header_key)
-                    break
+            # Need to get the actual casing of the summary - the summary has been CaseFold - so
+            # it comes from the first line that matches it
+            summary_text = first_seen.get(header_key)
+            if summary_text is not None:
+                previous_position = parsed.order().index(header_key)
+                parsed.insert_field(
+                    "Summary",
+                    FieldStr(summary_text.strip()),
+                    FIELD_MD_TYPE.IMPLICIT_SUMMARY,
+                    previous_position,
+                )
+                parsed.remove_field(header_key)
         else:
             raise InvalidFileError("No clear summary field")
 
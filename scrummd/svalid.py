@@ -1,17 +1,26 @@
 """Return an exit code if there's any invalid files, or rules being broken.
 
 Returns: 0 if Successful; 1 if Exception Raised; 2 if Invalid File; 3 if Rules Violation.
+With --all, the highest exit code of all the problems found.
 
 """
 
 import argparse
 from enum import Enum
+import json
 import sys
+from typing import Any, Optional
 
-from scrummd.collection import get_collection
+from scrummd.collection import find_problems, get_collection, validate_changes
 from scrummd.config import ScrumConfig
-from scrummd.config_loader import load_fs_config
-from scrummd.exceptions import InvalidFileError, RuleViolationError
+from scrummd.config_loader import add_jobs_argument, apply_arguments, load_fs_config
+from scrummd.exceptions import (
+    ChangeDetectionError,
+    InvalidFileError,
+    RuleViolationError,
+    ValidationError,
+)
+from scrummd.vcs import changed_files
 from scrummd.version import version_to_output
 
 
@@ -22,9 +31,17 @@ class ExitCode(Enum):
     RULE_VIOLATION = 3
 
 
-def get_exit_code(config: ScrumConfig) -> ExitCode:
+def get_exit_code(config: ScrumConfig, changed_since: Optional[str] = None) -> ExitCode:
     """Return what the exit code should be
 
+    Args:
+        config (ScrumConfig): ScrumMD configuration
+        changed_since (Optional[str], optional): Only validate the cards changed since this git
+            ref, and the collections they could affect. Defaults to None (validating everything).
+
+    Raises:
+        ChangeDetectionError: The changed cards couldn't be found with git
+
     Returns:
         ExitCode: Validation status of the repository
     """
@@ -32,7 +49,10 @@ def get_exit_code(config: ScrumConfig) -> ExitCode:
     config.strict = True
 
     try:
-        get_collection(config)
+        if changed_since is None:
+            get_collection(config)
+        else:
+            validate_changes(config, changed_files(config.scrum_path, changed_since))
     except InvalidFileError:
         return ExitCode.INVALID_FILE
     except RuleViolationError:
@@ -43,6 +63,47 @@ def get_exit_code(config: ScrumConfig) -> ExitCode:
     return ExitCode.SUCCESSFUL
 
 
+def _error_exit_code(error: ValidationError) -> ExitCode:
+    """Exit code for a problem with a card"""
+    if isinstance(error, InvalidFileError):
+        return ExitCode.INVALID_FILE
+    if isinstance(error, RuleViolationError):
+        return ExitCode.RULE_VIOLATION
+    return ExitCode.OTHER_FAILURE
+
+
+def get_report(config: ScrumConfig) -> tuple[ExitCode, dict[str, Any]]:
+    """Validate every card, finding every problem rather than stopping at the first
+
+    Args:
+        config (ScrumConfig): ScrumMD configuration
+
+    Returns:
+        tuple[ExitCode, dict[str, Any]]: The highest exit code of the problems found, and a
+            report of them that can be written as JSON
+    """
+    problems = find_problems(config)
+    exit_code = max(
+        (_error_exit_code(problem.error) for problem in problems),
+        key=lambda code: code.value,
+        default=ExitCode.SUCCESSFUL,
+    )
+    report = {
+        "exit_code": exit_code.value,
+        "problems": [
+            {
+                "path": problem.path,
+                "collection": problem.collection,
+                "error": type(problem.error).__name__,
+                "message": str(problem.error),
+                "exit_code": _error_exit_code(problem.error).value,
+            }
+            for problem in problems
+        ],
+    }
+    return exit_code, report
+
+
 def create_parser() -> argparse.ArgumentParser:
     """Create an argument parser for svalid
 
@@ -56,6 +117,20 @@ def create_parser() -> argparse.ArgumentParser:
         action="version",
         version=version_to_output(),
     )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--all",
+        action="store_true",
+        help="Find every problem rather than stopping at the first, and write them to stdout "
+        + "as a JSON report. Parses with one worker process per CPU unless --jobs is given.",
+    )
+    mode.add_argument(
+        "--changed-since",
+        metavar="REF",
+        help="Only validate the cards changed since the git REF (including uncommitted and "
+        + "untracked cards), and the collections they could affect.",
+    )
+    add_jobs_argument(parser)
     return parser
 
 
@@ -64,8 +139,22 @@ def entry() -> None:
     args = create_parser().parse_args()
 
     config = load_fs_config()
+    apply_arguments(config, args)
 
-    sys.exit(get_exit_code(config).value)
+    if args.all:
+        if args.jobs is None:
+            config.workers = 0
+        exit_code, report = get_report(config)
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        sys.exit(exit_code.value)
+
+    try:
+        exit_code = get_exit_code(config, args.changed_since)
+    except ChangeDetectionError as ex:
+        print(ex, file=sys.stderr)
+        exit_code = ExitCode.OTHER_FAILURE
+    sys.exit(exit_code.value)
 
 
 if __name__ == "__main__":
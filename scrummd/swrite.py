@@ -11,9 +11,9 @@ from typing import List, TextIO
 from scrummd.collection import get_collection
 from scrummd.card import from_parsed
 from scrummd.exceptions import ModificationError
-from scrummd.formatter import format, DEFAULT_MD_TEMPLATE
+from scrummd.formatter import format_many, DEFAULT_MD_TEMPLATE
 from scrummd.config import ScrumConfig
-from scrummd.config_loader import load_fs_config
+from scrummd.config_loader import add_jobs_argument, apply_arguments, load_fs_config
 from scrummd.version import version_to_output
 
 logging.basicConfig(level=logging.INFO)
@@ -71,6 +71,8 @@ def create_parser() -> argparse.ArgumentParser:
         help="Remove values (case insensitively) from an existing list in a card.",
     )
 
+    add_jobs_argument(parser)
+
     return parser
 
 
@@ -88,6 +90,7 @@ def entry(
 
     _config = config or load_fs_config()
     assert _config
+    apply_arguments(_config, args)
     collection = get_collection(_config)
 
     if not any((args.set, args.set_stdin, args.add, args.remove)):
@@ -147,8 +150,10 @@ def entry(
             for card in cards
         ]
 
-        for card in modified_cards:
-            formatted = format(_config, DEFAULT_MD_TEMPLATE, card, collection)
+        formatted_cards = format_many(
+            _config, DEFAULT_MD_TEMPLATE, modified_cards, collection
+        )
+        for card, formatted in zip(modified_cards, formatted_cards):
             if args.stdout:
                 _stdout.writelines(formatted)
             else:
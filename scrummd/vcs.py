@@ -0,0 +1,49 @@
+"""Find the files that have changed in the git repository holding the scrum folder.
+
+Only the local repository is read - nothing is fetched.
+"""
+
+import pathlib
+import subprocess
+
+from scrummd.exceptions import ChangeDetectionError
+
+
+def _git(path: str | pathlib.Path, *args: str) -> list[str]:
+    """Run a git command in the folder, and return the NUL separated names it outputs"""
+    try:
+        completed = subprocess.run(
+            ["git", "-C", str(path), *args],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+    except FileNotFoundError:
+        raise ChangeDetectionError("git is not installed")
+    except subprocess.CalledProcessError as ex:
+        raise ChangeDetectionError(f"git {' '.join(args)} failed: {ex.stderr.strip()}")
+    return [name for name in completed.stdout.split("\0") if name]
+
+
+def changed_files(path: str | pathlib.Path, ref: str) -> list[pathlib.Path]:
+    """Files in a folder that are different to how they were at a git ref
+
+    That's files changed (or added, or removed) in commits since the ref, staged, or changed in
+    the working tree - and untracked files that aren't ignored.
+
+    Args:
+        path (str | pathlib.Path): Folder in a git repository
+        ref (str): Commit, branch, tag or other git revision to compare to
+
+    Raises:
+        ChangeDetectionError: git isn't installed, the folder isn't in a repository, or the ref
+            isn't known (or starts with -, so git would take it as an option)
+
+    Returns:
+        list[pathlib.Path]: Paths of the files, inside the folder
+    """
+    if ref.startswith("-"):
+        raise ChangeDetectionError(f"{ref} is not a git revision")
+    changed = _git(path, "diff", "--name-only", "--relative", "-z", ref, "--")
+    untracked = _git(path, "ls-files", "--others", "--exclude-standard", "-z")
+    return [pathlib.Path(path, name) for name in dict.fromkeys(changed + untracked)]
@@ -0,0 +1,132 @@
+"""Tests for `cache.py`"""
+
+import copy
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+import scrummd.loader
+from scrummd.cache import cache_folder, config_hash, open_cache
+from scrummd.collection import get_collection
+from fixtures import data_config
+
+
+@pytest.fixture(scope="function")
+def cached_config(data_config, tmp_path, monkeypatch):
+    """Config pointing at a copy of the test data, with caching enabled (into a temporary folder)"""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "user_cache"))
+    config = copy.deepcopy(data_config)
+    config.scrum_path = str(tmp_path / "data")
+    config.cache = True
+    shutil.copytree("test/data", config.scrum_path)
+    return config
+
+
+def _count_parses(monkeypatch) -> list[str]:
+    """Record the path of every card that's parsed rather than read from the cache"""
+    parsed: list[str] = []
+    original = scrummd.loader.from_str
+
+    def counting_from_str(config, input_card, collection_from_path, path, *args):
+        parsed.append(str(path))
+        return original(config, input_card, collection_from_path, path, *args)
+
+    monkeypatch.setattr(scrummd.loader, "from_str", counting_from_str)
+    return parsed
+
+
+def test_cache_reused(cached_config, monkeypatch):
+    """Test that unchanged cards aren't parsed a second time"""
+    first = get_collection(cached_config)
+    assert (cache_folder(cached_config) / "parse_cache.pickle").exists()
+
+    parsed = _count_parses(monkeypatch)
+    second = get_collection(cached_config)
+
+    assert parsed == []
+    assert list(first.keys()) == list(second.keys())
+    assert second["c1"].udf == first["c1"].udf
+    assert second["c1"]._config is cached_config
+
+
+def test_cache_outside_scrum_path(cached_config, tmp_path):
+    """Test that the cache is written to the user's cache folder, and not into the scrum path"""
+    get_collection(cached_config)
+    folder = cache_folder(cached_config)
+    assert folder.is_relative_to(tmp_path / "user_cache")
+    assert os.listdir(folder) == ["parse_cache.pickle"]
+    assert not any(
+        path.name == "parse_cache.pickle"
+        for path in Path(cached_config.scrum_path).rglob("*")
+    )
+
+
+def test_cache_reparses_changed_file(cached_config, monkeypatch):
+    """Test that only a modified card is parsed again"""
+    get_collection(cached_config)
+    path = Path(cached_config.scrum_path, "collection1", "c1.md")
+    contents = path.read_text().replace("Bob", "Robert")
+    path.write_text(contents)
+    # Make sure the change is visible even on filesystems with coarse timestamps
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    parsed = _count_parses(monkeypatch)
+    collection = get_collection(cached_config)
+
+    assert parsed == [str(path)]
+    assert collection["c1"].udf["assignee"] == "Robert"
+
+
+def test_cache_invalidated_by_config(cached_config, monkeypatch):
+    """Test that changing config that affects parsing discards the cache"""
+    get_collection(cached_config)
+    cached_config.allow_header_summary = True
+
+    parsed = _count_parses(monkeypatch)
+    get_collection(cached_config)
+
+    assert len(parsed) > 0
+
+
+def test_cache_forgets_removed_file(cached_config):
+    """Test that cards for deleted files are removed from the cache"""
+    get_collection(cached_config)
+    os.remove(Path(cached_config.scrum_path, "collection1", "c1.md"))
+
+    collection = get_collection(cached_config)
+    parse_cache = open_cache(cached_config)
+
+    assert "c1" not in collection
+    assert parse_cache is not None
+    assert str(Path(cached_config.scrum_path, "collection1", "c1.md")) not in (
+        parse_cache._entries
+    )
+
+
+def test_cached_lazy_cards_resolved(cached_config, data_config):
+    """Test that cards cached by a lazy load have all their fields when loaded eagerly"""
+    get_collection(cached_config, lazy=True)
+    collection = get_collection(cached_config)
+
+    eager = get_collection(data_config)
+    for index, card in collection.items():
+        assert not card.parsed_md.is_lazy
+        assert card.udf == eager[index].udf
+
+
+def test_cache_invalidated_by_collection_rules(cached_config):
+    """Test that a card cached with a deferred field is checked against new collection rules"""
+    path = Path(cached_config.scrum_path, "backlog", "owned.md")
+    path.parent.mkdir()
+    path.write_text("---\nsummary: Owned\n---\n\n# Owner\n\nalice\n")
+    assert get_collection(cached_config, lazy=True)["owned"].parsed_md.is_lazy
+    original_hash = config_hash(cached_config)
+
+    cached_config.collections = {"backlog": {"required": ["owner"]}}
+    cached_config.__post_init__()
+    assert config_hash(cached_config) != original_hash
+    collection = get_collection(cached_config, "backlog", lazy=True)
+    assert collection["owned"].get_field("owner") == "alice"
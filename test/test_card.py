@@ -1,7 +1,7 @@
 from copy import copy
 from pathlib import Path
 import pytest
-from scrummd.config import ScrumConfig
+from scrummd.config import CollectionConfig, ScrumConfig
 from scrummd.exceptions import (
     InvalidRestrictedFieldValueError,
     RequiredFieldNotPresentError,
@@ -100,3 +100,102 @@ estimate: 4.2
         data_config, card_str, "collection", Path("collection/float.md")
     )
     assert card.udf["estimate"] == FieldNumber(4.2)
+
+
+LAZY_CARD = """
+---
+summary: lazy card
+estimate: 3
+---
+
+# Description
+
+Lots of text
+
+# Acceptance
+
+-   It works
+"""
+
+
+def test_lazy_card(data_config):
+    """Test that a lazy card only extracts the rest of the card when it's needed"""
+    card = scrummd.card.from_str(
+        data_config, LAZY_CARD, "collection", Path("collection/lazy.md"), lazy=True
+    )
+    eager_card = scrummd.card.from_str(
+        data_config, LAZY_CARD, "collection", Path("collection/lazy.md")
+    )
+    assert card.parsed_md.is_lazy
+    assert card.udf == {"estimate": FieldNumber(3)}
+
+    assert card.get_field("description") == "Lots of text"
+    assert not card.parsed_md.is_lazy
+    assert card.udf == eager_card.udf
+    assert card.parsed_md.order() == eager_card.parsed_md.order()
+
+
+@pytest.mark.parametrize(
+    "rest",
+    [
+        "# Description\n\nSee [[other]]\n",
+        "# Tags\n\n-   tag\n",
+        "# Key\n\nvalid\n",
+        "Description\n===========\n\nText\n",
+        "# Description\n\n---\nother: property\n---\n",
+        "# Summary Two\n\ntext\n\n# Estimate\n\n5\n",
+    ],
+)
+def test_lazy_card_not_deferred(data_config, rest):
+    """Test that a card isn't lazy if the rest of it could change the card"""
+    card_str = "---\nsummary: eager card\nestimate: 3\n---\n\n" + rest
+    card = scrummd.card.from_str(
+        data_config, card_str, "collection", Path("collection/eager.md"), lazy=True
+    )
+    assert not card.parsed_md.is_lazy
+
+
+def test_cards_are_compact(data_config):
+    """Test that cards don't carry a __dict__, and share their field names"""
+    first = scrummd.card.from_str(
+        data_config, LAZY_CARD, "collection", Path("collection/first.md")
+    )
+    second = scrummd.card.from_str(
+        data_config, LAZY_CARD, "collection", Path("collection/second.md")
+    )
+    assert not hasattr(first, "__dict__")
+    assert not hasattr(first.parsed_md.meta("estimate"), "__dict__")
+    assert not hasattr(first.udf["estimate"], "__dict__")
+
+    first_key = next(key for key in first.udf if key == "description")
+    second_key = next(key for key in second.udf if key == "description")
+    assert first_key is second_key
+
+
+def test_lazy_card_checked_against_rules(data_config):
+    """Test that a lazy card's deferred fields are checked against collection rules"""
+    card = scrummd.card.from_str(
+        data_config,
+        "---\nsummary: lazy card\n---\n\n# Other\n\ninvalid\n",
+        "collection",
+        Path("collection/lazy.md"),
+        lazy=True,
+    )
+    assert card.parsed_md.is_lazy
+    with pytest.raises(InvalidRestrictedFieldValueError):
+        card.assert_valid_rules(CollectionConfig(fields={"other": ["valid"]}))
+    with pytest.raises(RequiredFieldNotPresentError):
+        card.assert_valid_rules(CollectionConfig(required=["owner"]))
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_header_repeating_property(data_config, lazy):
+    """Test that a header repeating a property replaces it, whether or not the card is lazy"""
+    card = scrummd.card.from_str(
+        data_config,
+        "---\nsummary: S\nowner: alice\n---\n\n# Owner\n\nbob\n",
+        "collection",
+        Path("collection/owned.md"),
+        lazy=lazy,
+    )
+    assert card.get_field("owner") == "bob"
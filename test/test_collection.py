@@ -2,20 +2,27 @@
 
 from copy import copy
 import os
+import shutil
 import pytest
 from pathlib import Path
 
 from scrummd.config import ScrumConfig
 from scrummd.collection import (
+    CollectionIndex,
     Filter,
     SortCriteria,
+    build_backlinks,
     get_collection,
+    iter_cards,
     group_collection,
+    filter_cards,
     filter_collection,
+    load_collection_index,
     sort_collection,
 )
 from fixtures import data_config
-from scrummd.exceptions import RuleViolationError
+from scrummd.exceptions import RuleViolationError, ValidationError
+import scrummd.loader
 
 
 # NOTE: These almost all retrieve the same set of data. We might want to think
@@ -194,6 +201,41 @@ def test_filtering(data_config, filters, expected_card_ids):
     assert set(result) == set(expected_card_ids)
 
 
+@pytest.mark.parametrize(
+    "filters",
+    [
+        [Filter("assignee", "bob"), Filter("status", "ready")],
+        [Filter("assignee", ["Bob", "Mary"])],
+        [Filter("assignee", "none")],
+        [Filter("collections", "sort_collection")],
+        [Filter("no_such_field", "none"), Filter("status", "ready")],
+    ],
+    ids=["Multiple conditions", "2 values", "Missing field", "List field", "No field"],
+)
+def test_filtering_with_index(data_config, filters):
+    """Test that filtering with an index gives the same cards, in the same order, as without"""
+    collection_index = load_collection_index(data_config)
+    collection = collection_index.get("sort_collection")
+    assert list(filter_collection(collection, filters, collection_index).keys()) == list(
+        filter_collection(collection, filters).keys()
+    )
+
+
+def test_filtering_collection_not_indexed(data_config):
+    """Test that filtering part of the cards doesn't index every card, unless it's already indexed"""
+    collection_index = load_collection_index(data_config)
+    collection = collection_index.get("sort_collection")
+    filters = [Filter("status", "ready")]
+    expected = list(filter_collection(collection, filters).keys())
+
+    assert list(filter_collection(collection, filters, collection_index).keys()) == expected
+    assert not collection_index.is_indexed("status")
+
+    filter_collection(collection_index.get(), filters, collection_index)
+    assert collection_index.is_indexed("status")
+    assert list(filter_collection(collection, filters, collection_index).keys()) == expected
+
+
 @pytest.mark.parametrize(
     ["field", "expected_card_order"],
     [["Estimate", ["c6", "c4", "c5"]]],
@@ -203,6 +245,30 @@ def test_sorting(data_config, field, expected_card_order):
     pass
 
 
+def test_group_collection_missing_field(data_config):
+    """Test that cards without the field being grouped by are in the None group"""
+    test_collection = get_collection(data_config, "sort_collection")
+    grouped = group_collection(data_config, test_collection, ["estimate"])
+    assert list(grouped[None].collection.keys()) == ["c3"]
+
+
+def test_multiple_groupbys_sorted(data_config):
+    """Test that the groups at every level, and the cards in them, are sorted"""
+    test_collection = get_collection(data_config, "sort_collection")
+    grouped = group_collection(
+        data_config,
+        test_collection,
+        ["status", "assignee"],
+        [SortCriteria("assignee", True), SortCriteria("estimate", False)],
+    )
+    assert list(grouped.keys()) == ["ready", "done", None]
+    assert list(grouped["ready"].groups.keys()) == ["mary", "bob", None]
+    assert list(grouped["done"].groups.keys()) == ["mary", "bob", "aleph", None]
+    assert not grouped["done"].collection
+    assert list(grouped["done"].groups["mary"].collection.keys()) == ["c5", "c6"]
+    assert list(grouped[None].groups.keys()) == [None]
+
+
 def test_group_sorting(data_config):
     """Test that groups are in the order specified by sort"""
     test_collection = get_collection(data_config, "collection1")
@@ -255,6 +321,50 @@ def test_sorting_collection_multiple_criteria(data_config):
     assert list(sorted_collection.keys()) == ["c4", "c1", "c3", "c6", "c2", "c5"]
 
 
+def test_sorting_keeps_order_of_ties(data_config):
+    """Test that cards the criteria can't separate stay in the order they were in, in either
+    direction"""
+    test_collection = get_collection(data_config, "sort_collection")
+    # sort_collection lists c6, c2, c3, c4, c5, c1
+    sorted_collection = sort_collection(
+        test_collection,
+        [SortCriteria("assignee", True)],
+    )
+    assert list(sorted_collection.keys()) == ["c6", "c2", "c5", "c3", "c1", "c4"]
+
+    sorted_collection = sort_collection(
+        test_collection,
+        [SortCriteria("assignee", True), SortCriteria("estimate", False)],
+    )
+    assert list(sorted_collection.keys()) == ["c5", "c2", "c6", "c3", "c1", "c4"]
+
+
+@pytest.mark.parametrize(
+    ["criteria", "offset", "limit"],
+    [
+        [[], 2, 3],
+        [[SortCriteria("estimate", False)], 0, 2],
+        [[SortCriteria("assignee", True)], 1, 3],
+        [[SortCriteria("assignee", False), SortCriteria("estimate", True)], 2, None],
+        [[SortCriteria("assignee", True), SortCriteria("estimate", False)], 4, 10],
+    ],
+    ids=[
+        "Unsorted",
+        "1 criteria",
+        "1 reversed criteria",
+        "Offset only",
+        "Past the end",
+    ],
+)
+def test_sorting_page(data_config, criteria, offset, limit):
+    """Test that a page of a sorted collection is the same as that part of the whole"""
+    test_collection = get_collection(data_config, "sort_collection")
+    whole = list(sort_collection(test_collection, criteria).keys())
+    end = None if limit is None else offset + limit
+    page = sort_collection(test_collection, criteria, offset, limit)
+    assert list(page.keys()) == whole[offset:end]
+
+
 def test_sorting_inside_group(data_config):
     """Test that the inner parts of groups are sorted correctly"""
     test_collection = get_collection(data_config, "sort_collection")
@@ -266,3 +376,170 @@ def test_sorting_inside_group(data_config):
         "c2",
         "c6",
     ]
+
+
+@pytest.fixture(scope="function")
+def copied_config(data_config, tmp_path):
+    """Config for a copy of the test data, that the test can change"""
+    config = copy(data_config)
+    shutil.copytree(data_config.scrum_path, tmp_path / "data")
+    config.scrum_path = str(tmp_path / "data")
+    return config
+
+
+def assert_same_as_fresh(collection_index: CollectionIndex):
+    """Assert that an updated index has the same cards and collections as loading it again"""
+    fresh = load_collection_index(collection_index.config)
+    assert set(collection_index.all_cards) == set(fresh.all_cards)
+    assert collection_index.paths == fresh.paths
+    assert collection_index.collections.keys() == fresh.collections.keys()
+    for name, collection in fresh.collections.items():
+        assert list(collection_index.collections[name].keys()) == list(collection.keys())
+
+
+def test_update_changed(copied_config):
+    """Test that changing a card only rebuilds the collections it's in, or referenced in"""
+    collection_index = load_collection_index(copied_config)
+    c1_path = Path(copied_config.scrum_path, "collection1", "c1.md")
+    c1_path.write_text("---\nSummary: Moved\nTags:\n    - moved\n---\n")
+
+    affected = collection_index.update(changed=[c1_path])
+
+    assert {"collection1", "moved", "collection3"} <= affected
+    assert "collection2" not in affected
+    assert "special" not in affected
+    assert collection_index.all_cards["c1"].summary == "Moved"
+    assert "c1" in collection_index.collections["moved"]
+    # Still in collection3, by reference
+    assert collection_index.collections["collection3"]["c1"].summary == "Moved"
+    assert_same_as_fresh(collection_index)
+
+
+def test_update_added_and_removed(copied_config):
+    """Test that added and removed cards are reflected in the collections"""
+    collection_index = load_collection_index(copied_config)
+    c4_path = Path(copied_config.scrum_path, "collection2", "c4.md")
+    os.remove(c4_path)
+    new_path = Path(copied_config.scrum_path, "collection1", "embedded", "new.md")
+    new_path.write_text("---\nSummary: New\n---\n")
+
+    affected = collection_index.update(added=[new_path], removed=[c4_path])
+
+    assert "c4" not in collection_index.all_cards
+    assert "new" in collection_index.collections["collection1.embedded"]
+    assert "c4" not in collection_index.collections["collection3.special"]
+    assert "collection1.embedded" in affected
+    assert "collection3.special" in affected
+    assert_same_as_fresh(collection_index)
+
+
+def test_update_referenced_card_added(copied_config):
+    """Test that adding a card that's already referenced adds it to the referencing collections"""
+    c5_path = Path(copied_config.scrum_path, "collection2", "c5.md")
+    c5_contents = c5_path.read_text()
+    os.remove(c5_path)
+    collection_index = load_collection_index(copied_config)
+    assert "collection3.key" not in collection_index.collections
+
+    c5_path.write_text(c5_contents)
+    collection_index.update(added=[str(c5_path)])
+
+    assert list(collection_index.collections["collection3.key"].keys()) == ["c5"]
+    assert "c5" in collection_index.collections["collection3"]
+
+
+def test_update_ignored_paths(copied_config):
+    """Test that files outside of the scrum folder, or hidden, aren't loaded"""
+    collection_index = load_collection_index(copied_config)
+    hidden_path = Path(copied_config.scrum_path, ".hidden.md")
+    hidden_path.write_text("---\nSummary: Hidden\n---\n")
+
+    assert collection_index.update(added=[hidden_path, "/elsewhere/card.md"]) == set()
+    assert ".hidden" not in collection_index.all_cards
+
+
+def test_backlinks(data_config):
+    """Test that the cards referring to each card are found, once each, in order"""
+    backlinks = build_backlinks(get_collection(data_config))
+    assert backlinks["c1"] == ["sort_collection", "collection3"]
+    assert backlinks["c6"] == ["sort_collection"]
+    assert "collection3" not in backlinks
+
+
+def test_backlinks_updated(copied_config):
+    """Test that backlinks follow changes to the cards"""
+    collection_index = load_collection_index(copied_config)
+    assert collection_index.backlinks["c5"] == ["sort_collection", "collection3"]
+
+    Path(copied_config.scrum_path, "collection3.md").write_text(
+        "---\nSummary: No more references\n---\n"
+    )
+    collection_index.update(changed=[Path(copied_config.scrum_path, "collection3.md")])
+    assert collection_index.backlinks["c5"] == ["sort_collection"]
+
+    # Referring to it again puts it back in its place, ahead of any cards after it
+    Path(copied_config.scrum_path, "collection3.md").write_text(
+        "---\nSummary: References again\nblocks: \"[[c5]]\"\n---\n"
+    )
+    collection_index.update(changed=[Path(copied_config.scrum_path, "collection3.md")])
+    assert collection_index.backlinks == build_backlinks(collection_index.all_cards)
+    assert collection_index.backlinks["c5"] == ["sort_collection", "collection3"]
+
+
+def test_filtering_with_index_updated(copied_config):
+    """Test that the field index follows changes to the cards"""
+    collection_index = load_collection_index(copied_config)
+    filters = [Filter("status", "done")]
+    before = filter_collection(collection_index.all_cards, filters, collection_index)
+    assert "c1" not in before
+
+    c1_path = Path(copied_config.scrum_path, "collection1", "c1.md")
+    c1_path.write_text(c1_path.read_text().replace("Ready", "Done"))
+    collection_index.update(changed=[c1_path])
+    after = filter_collection(collection_index.all_cards, filters, collection_index)
+    assert list(after.keys()) == list(
+        filter_collection(collection_index.all_cards, filters).keys()
+    )
+    assert "c1" in after
+
+
+def test_iter_cards(data_config):
+    """Test that iter_cards yields the same cards, in the same order, as get_collection"""
+    assert [card.index for card in iter_cards(data_config)] == list(
+        get_collection(data_config).keys()
+    )
+
+
+def test_iter_cards_streams(data_config, monkeypatch):
+    """Test that the first card is yielded before the rest are loaded"""
+    loaded = []
+    original_from_str = scrummd.loader.from_str
+
+    def counting_from_str(*args):
+        loaded.append(args)
+        return original_from_str(*args)
+
+    monkeypatch.setattr(scrummd.loader, "from_str", counting_from_str)
+    cards = iter_cards(data_config)
+    next(cards)
+    assert len(loaded) == 1
+    cards.close()
+
+
+def test_iter_cards_validates_collections(copied_config):
+    """Test that cards breaking the rules of their collection fail once all are loaded"""
+    Path(copied_config.scrum_path, "collection4", "no_assignee.md").write_text(
+        "---\nSummary: No assignee\n---\n"
+    )
+    cards = iter_cards(copied_config)
+    with pytest.raises(ValidationError):
+        for _ in cards:
+            pass
+
+
+def test_filter_cards(data_config):
+    """Test that filtering cards as they're loaded matches filtering the collection"""
+    filters = [Filter("assignee", ["Bob", "Mary"]), Filter("status", "done")]
+    assert [card.index for card in filter_cards(iter_cards(data_config), filters)] == list(
+        filter_collection(get_collection(data_config), filters).keys()
+    )
@@ -1,7 +1,8 @@
+import argparse
 import os
 import pytest
 from scrummd import const
-from scrummd.config_loader import load_fs_config
+from scrummd.config_loader import add_jobs_argument, load_fs_config
 import tempfile
 from pathlib import Path
 
@@ -154,3 +155,37 @@ def test_sbl_config(temp_dir, sbl_config_f):
     """Test that the SBL config field is set from the file"""
     config = load_fs_config()
     assert config.sbl.columns == ["index"]
+
+
+@pytest.mark.parametrize("argument", ["-1", "two"])
+def test_invalid_jobs_argument(argument, capsys):
+    """Test that --jobs has to be a whole number that isn't negative"""
+    parser = argparse.ArgumentParser()
+    add_jobs_argument(parser)
+    with pytest.raises(SystemExit):
+        parser.parse_args(["--jobs", argument])
+    assert "--jobs" in capsys.readouterr().err
+
+
+def test_negative_workers_config(temp_dir):
+    """Test that a negative amount of workers in the config is refused"""
+    with open(Path(temp_dir, "scrum.toml"), "w") as fo:
+        fo.write("[tool.scrummd]\nworkers = -1\n")
+    with pytest.raises(ValueError):
+        load_fs_config()
+
+
+def test_negative_prefetch_config(temp_dir):
+    """Test that a negative amount of card files to prefetch in the config is refused"""
+    with open(Path(temp_dir, "scrum.toml"), "w") as fo:
+        fo.write("[tool.scrummd]\nprefetch = -1\n")
+    with pytest.raises(ValueError, match="prefetch"):
+        load_fs_config()
+
+
+def test_invalid_io_mode_config(temp_dir):
+    """Test that an io_mode that isn't one of the ways to read files is refused"""
+    with open(Path(temp_dir, "scrum.toml"), "w") as fo:
+        fo.write('[tool.scrummd]\nio_mode = "mmmap"\n')
+    with pytest.raises(ValueError, match="io_mode"):
+        load_fs_config()
@@ -0,0 +1,186 @@
+"""Tests for `daemon.py`"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from scrummd import daemon
+from scrummd.collection import load_collection_index, serve_index
+from scrummd.config import ScrumConfig
+from scrummd.config_loader import load_fs_config
+
+pytestmark = pytest.mark.skipif(
+    not daemon.is_supported(), reason="Requires Unix domain sockets"
+)
+
+
+def _run(module: str, args: list[str], cwd: Path) -> subprocess.CompletedProcess:
+    """Run the entry point of a module, as the console script would"""
+    return subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys; from {module} import entry; sys.exit(entry())",
+        ]
+        + args,
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.getcwd()},
+    )
+
+
+@pytest.fixture(scope="function")
+def scrum_folder(tmp_path, monkeypatch):
+    """A folder with a copy of the test collection, and a config file pointing at it"""
+    # Keeps the socket (in the cache folder) out of the user's cache folder. Not in tmp_path, as
+    # that can be longer than a socket's path is allowed to be.
+    user_cache = tempfile.TemporaryDirectory()
+    monkeypatch.setenv("XDG_CACHE_HOME", user_cache.name)
+    shutil.copytree("test/data/collection1", tmp_path / "scrum")
+    (tmp_path / ".scrum.toml").write_text(
+        '[tool.scrummd]\nscrum_path = "scrum"\n\n'
+        + '[tool.scrummd.fields]\nstatus = ["Ready", "Done"]\n'
+    )
+    with user_cache:
+        yield tmp_path
+
+
+@pytest.fixture(scope="function")
+def running_daemon(scrum_folder):
+    """The daemon, running for the scrum folder"""
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "import sys; from scrummd.sdaemon import entry; sys.exit(entry())",
+        ],
+        cwd=scrum_folder,
+        env={**os.environ, "PYTHONPATH": os.getcwd()},
+    )
+    config = ScrumConfig(scrum_path=str(scrum_folder / "scrum"))
+    try:
+        for _ in range(100):
+            if daemon.request(config, {"command": "status"}) is not None:
+                break
+            time.sleep(0.05)
+        else:
+            pytest.fail("Daemon didn't start")
+        yield server
+    finally:
+        daemon.request(config, {"command": "stop"})
+        server.wait(timeout=10)
+
+
+@pytest.mark.parametrize(
+    ["module", "args"],
+    [
+        ["scrummd.sbl", ["-c", "index,summary,status"]],
+        ["scrummd.sbl", ["embedded", "-g", "status"]],
+        ["scrummd.sboard", ["-g", "status"]],
+        ["scrummd.scard", ["c1", "e1"]],
+        ["scrummd.sbl", ["--not-an-argument"]],
+    ],
+)
+def test_daemon_output_identical(scrum_folder, module, args, request):
+    """Test that output with the daemon running is the same as without it"""
+    local = _run(module, args, scrum_folder)
+
+    request.getfixturevalue("running_daemon")
+    remote = _run(module, args, scrum_folder)
+
+    assert remote.stdout == local.stdout
+    assert remote.stderr == local.stderr
+    assert remote.returncode == local.returncode
+
+
+def test_daemon_sees_changes(scrum_folder, running_daemon):
+    """Test that the daemon returns cards as they are on disk, not as they were loaded"""
+    card = scrum_folder / "scrum" / "c1.md"
+    card.write_text(card.read_text().replace("Bob", "Robert"))
+    stat = os.stat(card)
+    os.utime(card, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    result = _run("scrummd.sbl", ["-c", "index,assignee"], scrum_folder)
+    assert "c1, Robert" in result.stdout
+
+
+def test_daemon_sees_referenced_card_added(scrum_folder, running_daemon):
+    """Test that a card kept by the daemon references a card added after it was last output"""
+    (scrum_folder / "scrum" / "ref.md").write_text(
+        '---\nsummary: Refers to another card\nblocks: "[[later]]"\n---\n'
+    )
+    before = _run("scrummd.scard", ["ref"], scrum_folder)
+    assert "[[later - MISSING]]" in before.stdout
+
+    (scrum_folder / "scrum" / "later.md").write_text("---\nsummary: Added later\n---\n")
+    after = _run("scrummd.scard", ["ref"], scrum_folder)
+    assert "MISSING" not in after.stdout
+    assert "[[later]]" in after.stdout
+
+
+def _touch(path: Path) -> None:
+    """Move the modification time of a file on, so the change is seen on any filesystem"""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture(scope="function")
+def server(scrum_folder, monkeypatch):
+    """A server for the scrum folder, with its cards loaded but not listening"""
+    monkeypatch.chdir(scrum_folder)
+    server = daemon.Server(load_fs_config())
+    try:
+        server.warm()
+        yield server
+    finally:
+        serve_index(None)
+
+
+def _loaded_without_server(config: ScrumConfig) -> list[str]:
+    """Indexes of the cards as they'd be loaded if the server wasn't running"""
+    served = load_collection_index(config)
+    serve_index(None)
+    try:
+        return list(load_collection_index(config).all_cards)
+    finally:
+        serve_index(served)
+
+
+def test_server_keeps_index(scrum_folder, server):
+    """Test that commands use the server's index, which is updated for the changed cards"""
+    config = load_fs_config()
+    served = load_collection_index(config)
+    assert load_collection_index(load_fs_config()) is served
+
+    card = scrum_folder / "scrum" / "c1.md"
+    card.write_text(card.read_text().replace("Bob", "Robert"))
+    _touch(card)
+    server.refresh()
+    assert load_collection_index(config) is served
+    assert served.all_cards["c1"].get_field("assignee") == "Robert"
+
+    (scrum_folder / "scrum" / "c0.md").write_text("---\nsummary: Added\n---\n")
+    (scrum_folder / "scrum" / "c2.md").unlink()
+    server.refresh()
+    assert list(load_collection_index(config).all_cards) == _loaded_without_server(
+        config
+    )
+
+
+def test_server_not_serving_problems(scrum_folder, server):
+    """Test that cards with problems aren't served, so the commands report the problems"""
+    config = load_fs_config()
+    (scrum_folder / "scrum" / "bad.md").write_text(
+        "---\nsummary: Bad\nstatus: Unknown\n---\n"
+    )
+    server.refresh()
+    served = load_collection_index(config)
+    assert load_collection_index(config) is not served
+    assert "bad" not in served.all_cards
@@ -80,7 +80,7 @@ def test_default_md_fields(card_key: str, field: str, test_collection, data_conf
 
     card, reread = reread_card(card_key, test_collection, data_config)
 
-    assert card.__dict__[field] == reread.__dict__[field]
+    assert getattr(card, field) == getattr(reread, field)
 
 
 @pytest.mark.parametrize("card_key", IMPLICIT_SUMMARY_KEYS)
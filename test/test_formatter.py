@@ -1,6 +1,10 @@
+import copy
+import os
 from pathlib import Path
 import pytest
+from scrummd.cache import cache_folder
 import scrummd.card
+import scrummd.collection
 import scrummd.formatter
 from fixtures import data_config, test_collection
 
@@ -79,3 +83,76 @@ key: Field [[c2]]
         data_config, template, card, test_collection
     )
     assert result == "Field [[ c2 ]]"
+
+
+@pytest.fixture(scope="function")
+def template_config(data_config, tmp_path, monkeypatch):
+    """Config with its own templates folder, and no templates compiled yet"""
+    config = copy.deepcopy(data_config)
+    config.scrum_path = str(tmp_path)
+    (tmp_path / "templates").mkdir()
+    (tmp_path / "templates" / "test.j2").write_text("first {{ card.summary }}")
+    monkeypatch.setattr(scrummd.formatter, "_compiled_templates", {})
+    return config
+
+
+def test_template_cached(template_config):
+    """Test that a template is only compiled again if its file changes"""
+    template = scrummd.formatter.load_template("test.j2", template_config)
+    assert scrummd.formatter.load_template("test.j2", template_config) is template
+
+    path = Path(template_config.scrum_path, "templates", "test.j2")
+    path.write_text("second {{ card.summary }}")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    changed = scrummd.formatter.load_template("test.j2", template_config)
+    assert changed is not template
+    assert changed.render(card={"summary": "card"}) == "second card"
+
+
+def test_template_bytecode_cache(template_config, monkeypatch, tmp_path):
+    """Test that with caching enabled, templates aren't compiled again in a later run"""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "user_cache"))
+    template_config.cache = True
+    template = scrummd.formatter.load_template("test.j2", template_config)
+    assert any((cache_folder(template_config) / "templates").iterdir())
+
+    # As if it's a new run
+    monkeypatch.setattr(scrummd.formatter, "_compiled_templates", {})
+
+    def no_compile(*args, **kwargs):
+        raise AssertionError("Template compiled again")
+
+    monkeypatch.setattr(scrummd.formatter.environment(), "compile", no_compile)
+    cached = scrummd.formatter.load_template("test.j2", template_config)
+    assert cached is not template
+    assert cached.render(card={"summary": "card"}) == "first card"
+
+
+def test_backlinks_template_variable(data_config, test_collection):
+    """Test that templates get the cards that refer to the card"""
+    result = scrummd.formatter.format_from_str(
+        data_config,
+        "{% for card in backlinks %}{{ card.index }} {% endfor %}",
+        test_collection["c4"],
+        test_collection,
+    )
+    assert result == "sort_collection collection3 "
+
+
+def test_backlinks_passed(data_config, test_collection, monkeypatch):
+    """Test that backlinks that have already been found (as by CollectionIndex) are used"""
+
+    def no_build_backlinks(collection):
+        raise AssertionError("Backlinks found again")
+
+    monkeypatch.setattr(scrummd.formatter, "build_backlinks", no_build_backlinks)
+    result = scrummd.formatter.format_from_str(
+        data_config,
+        "{% for card in backlinks %}{{ card.index }} {% endfor %}",
+        test_collection["c4"],
+        test_collection,
+        {"c4": ["collection3", "not_in_collection"]},
+    )
+    assert result == "collection3 "
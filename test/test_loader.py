@@ -0,0 +1,208 @@
+"""Tests for `loader.py`"""
+
+import copy
+import shutil
+from pathlib import Path
+
+import pytest
+
+import scrummd.collection
+import scrummd.loader
+from scrummd.collection import get_collection
+from scrummd.exceptions import DuplicateIndexError, InvalidFileError
+from scrummd.source_md import DeferredFile
+from fixtures import data_config
+
+
+@pytest.fixture(scope="function")
+def parallel(monkeypatch):
+    """Parse in worker processes, no matter how few cards there are"""
+    monkeypatch.setattr(scrummd.loader, "PARALLEL_THRESHOLD", 0)
+
+
+def test_parallel_matches_serial(data_config, parallel):
+    """Test that loading in parallel returns the same collection as loading serially"""
+    serial = get_collection(data_config, "collection3")
+    config = copy.deepcopy(data_config)
+    config.workers = 2
+
+    parallel_collection = get_collection(config, "collection3")
+    assert list(parallel_collection.keys()) == list(serial.keys())
+
+    everything = get_collection(config)
+    assert list(everything.keys()) == list(get_collection(data_config).keys())
+    assert everything["c1"].udf == get_collection(data_config)["c1"].udf
+    assert everything["c1"]._config is config
+
+
+def test_load_cards_in_batches(data_config, parallel, monkeypatch):
+    """Test that the first cards are loaded before every card file has been found"""
+    monkeypatch.setattr(scrummd.loader, "LOAD_BATCH_SIZE", 2)
+    config = copy.deepcopy(data_config)
+    config.workers = 2
+    found = []
+
+    def to_load():
+        for card_path in scrummd.loader.card_paths(config):
+            found.append(card_path)
+            yield card_path
+
+    loading = scrummd.loader.load_cards(config, to_load=to_load())
+    first_path, _ = next(loading)
+    assert len(found) == 2
+    assert first_path == found[0][0]
+
+    loaded = [first_path] + [path for path, _ in loading]
+    assert loaded == [path for path, _ in scrummd.loader.card_paths(config)]
+
+
+def test_parallel_strict_error(data_config, parallel):
+    """Test that an invalid file raises the same error in parallel"""
+    config = copy.deepcopy(data_config)
+    config.workers = 2
+    config.scrum_path = "test/special_cases/invalid"
+    with pytest.raises(InvalidFileError):
+        get_collection(config)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_duplicate_index(data_config, parallel, tmp_path, workers, prefetch):
+    """Test that a duplicated index is detected the same way serially and in parallel"""
+    config = copy.deepcopy(data_config)
+    config.workers = workers
+    config.prefetch = prefetch
+    config.scrum_path = str(tmp_path / "data")
+    shutil.copytree("test/data/collection1", config.scrum_path)
+    shutil.copy(
+        Path(config.scrum_path, "c1.md"), Path(config.scrum_path, "embedded", "c1.md")
+    )
+
+    with pytest.raises(DuplicateIndexError):
+        get_collection(config)
+
+    config.strict = False
+    assert sorted(get_collection(config).keys()) == ["c1", "c2", "c3", "e1"]
+
+
+@pytest.mark.parametrize(
+    "collection_name",
+    ["collection1", "collection1.embedded", "collection2", "collection4"],
+)
+def test_collection_scoped_loading(data_config, monkeypatch, collection_name):
+    """Test that loading only a folder's cards returns the same collection as loading them all"""
+    scoped = get_collection(data_config, collection_name)
+
+    monkeypatch.setattr(scrummd.collection, "is_path_collection", lambda *_: False)
+    unscoped = get_collection(data_config, collection_name)
+
+    assert list(scoped.keys()) == list(unscoped.keys())
+
+
+def test_collection_scoped_loading_skips_cards(data_config, monkeypatch):
+    """Test that cards that can't be in the folder's collection aren't parsed"""
+    parsed: list[str] = []
+    original = scrummd.loader.from_str
+
+    def counting_from_str(config, input_card, collection_from_path, path, *args):
+        parsed.append(Path(path).name)
+        return original(config, input_card, collection_from_path, path, *args)
+
+    monkeypatch.setattr(scrummd.loader, "from_str", counting_from_str)
+    get_collection(data_config, "collection1.embedded")
+
+    assert parsed == ["e1.md"]
+
+
+def test_collection_scoped_loading_references(data_config, tmp_path):
+    """Test that cards referenced by a card defining the folder's collection are loaded"""
+    config = copy.deepcopy(data_config)
+    config.scrum_path = str(tmp_path / "data")
+    shutil.copytree("test/data", config.scrum_path)
+    Path(config.scrum_path, "collection1", "collection1.md").write_text(
+        "---\nsummary: Defines collection1\n---\n\n# Items\n\n- [[md1]]\n"
+    )
+
+    assert "md1" in get_collection(config, "collection1")
+
+
+def test_lazy_matches_eager(data_config):
+    """Test that lazily loaded cards end up the same as eagerly loaded cards"""
+    eager = get_collection(data_config)
+    lazy = get_collection(data_config, lazy=True)
+
+    assert list(lazy.keys()) == list(eager.keys())
+    assert any(card.parsed_md.is_lazy for card in lazy.values())
+    for index, card in lazy.items():
+        assert card.collections == eager[index].collections
+        assert card.defined_collections == eager[index].defined_collections
+        card.resolve()
+        assert card.udf == eager[index].udf
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_mmap_matches_read(data_config, lazy):
+    """Test that memory mapping the card files loads the same cards as reading them"""
+    config = copy.deepcopy(data_config)
+    config.io_mode = "mmap"
+    expected = get_collection(data_config)
+    mapped = get_collection(config, lazy=lazy)
+
+    assert list(mapped.keys()) == list(expected.keys())
+    for index, card in mapped.items():
+        card.resolve()
+        assert card.summary == expected[index].summary
+        assert card.udf == expected[index].udf
+        assert card.parsed_md.order() == expected[index].parsed_md.order()
+
+
+def test_mmap_defers_rest_of_file(data_config, tmp_path):
+    """Test that a lazily mapped card keeps none of the rest of its file, and reads it when needed"""
+    config = copy.deepcopy(data_config)
+    config.io_mode = "mmap"
+    config.scrum_path = str(tmp_path)
+    Path(tmp_path, "card.md").write_bytes(
+        b"---\r\nsummary: Mapped\r\n---\r\n\r\n# Log\r\n\r\nline 1\r\nline 2\r\n"
+    )
+
+    card = get_collection(config, lazy=True)["card"]
+    assert card.parsed_md._deferred == DeferredFile(str(Path(tmp_path, "card.md")))
+    assert card.get_field("log") == "line 1\nline 2"
+    assert not card.parsed_md.is_lazy
+
+
+@pytest.mark.parametrize("io_mode", ["read", "mmap"])
+def test_prefetch_matches_serial(data_config, io_mode):
+    """Test that prefetching the card files loads the same cards, in the same order"""
+    config = copy.deepcopy(data_config)
+    config.prefetch = 3
+    config.io_mode = io_mode
+    expected = get_collection(data_config)
+    prefetched = get_collection(config)
+
+    assert list(prefetched.keys()) == list(expected.keys())
+    for index, card in prefetched.items():
+        assert card.udf == expected[index].udf
+
+
+def test_prefetch_strict_error(data_config):
+    """Test that an invalid file raises the same error when prefetching"""
+    config = copy.deepcopy(data_config)
+    config.prefetch = 2
+    config.scrum_path = "test/special_cases/invalid"
+    with pytest.raises(InvalidFileError):
+        get_collection(config)
+
+
+def test_card_paths_ignores_hidden(data_config, tmp_path):
+    """Test that files and folders starting with . are left out"""
+    for name in ["a.md", ".a.md", ".git/b.md", "sub/c.md", "sub/.hidden/d.md"]:
+        Path(tmp_path, name).parent.mkdir(parents=True, exist_ok=True)
+        Path(tmp_path, name).write_text("")
+    config = copy.deepcopy(data_config)
+    config.scrum_path = str(tmp_path)
+
+    assert list(scrummd.loader.card_paths(config)) == [
+        (Path(tmp_path, "a.md"), ""),
+        (Path(tmp_path, "sub", "c.md"), "sub"),
+    ]
@@ -1,5 +1,22 @@
+import csv
+import io
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
 import pytest
-from scrummd.collection import Filter
+from fixtures import data_config
+from scrummd.collection import (
+    Filter,
+    filter_collection,
+    get_collection,
+    group_collection,
+)
+from scrummd.sbl.output import OutputConfig
+import scrummd.card
+import scrummd.sbl.board_output
+import scrummd.sbl.csv_output
 import scrummd.sbl.sbl
 
 
@@ -38,3 +55,148 @@ import scrummd.sbl.sbl
 )
 def test_include_to_filter(argument_value, expected_filter):
     assert scrummd.sbl.sbl.include_to_filter(argument_value) == expected_filter
+
+
+def test_referenced_by(data_config, monkeypatch, capsys):
+    """Test that --referenced-by lists only the cards referring to the index"""
+    monkeypatch.setattr(scrummd.sbl.sbl, "load_fs_config", lambda: data_config)
+    monkeypatch.setattr(
+        sys, "argv", ["sbl", "-H", "-c", "index", "--referenced-by", "c4"]
+    )
+    scrummd.sbl.sbl.entry()
+    assert capsys.readouterr().out.split() == ["sort_collection", "collection3"]
+
+
+def test_limit_and_offset(data_config, monkeypatch, capsys):
+    """Test that --limit and --offset output a page of the sorted cards"""
+    monkeypatch.setattr(scrummd.sbl.sbl, "load_fs_config", lambda: data_config)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["sbl", "sort_collection", "-H", "-c", "index", "-s", "^assignee"]
+        + ["--offset", "1", "--limit", "3"],
+    )
+    scrummd.sbl.sbl.entry()
+    assert capsys.readouterr().out.split() == ["c2", "c5", "c3"]
+
+
+@pytest.mark.parametrize("argument", ["-1", "ten"])
+def test_invalid_limit(argument):
+    with pytest.raises(SystemExit):
+        scrummd.sbl.sbl.create_parser().parse_args(["--limit", argument])
+
+
+def test_streamed_output(data_config, monkeypatch, capsys):
+    """Test that unsorted, ungrouped output (which is streamed) matches the collection"""
+    monkeypatch.setattr(scrummd.sbl.sbl, "load_fs_config", lambda: data_config)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["sbl", "-H", "-c", "index", "-i", "status=done", "--offset", "1"],
+    )
+    scrummd.sbl.sbl.entry()
+    expected = list(
+        filter_collection(get_collection(data_config), [Filter("status", "done")])
+    )[1:]
+    assert capsys.readouterr().out.split() == expected
+
+
+def test_startup_imports():
+    """Test that sbl doesn't import jinja2, which it only needs for templates"""
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, scrummd.sbl.sbl; print('jinja2' in sys.modules)",
+        ],
+        capture_output=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": os.getcwd()},
+        text=True,
+    )
+    assert completed.stdout.strip() == "False"
+
+
+def test_board_output(data_config, monkeypatch, capsys):
+    """Test the layout of a board too wide for the terminal"""
+    monkeypatch.setattr(
+        scrummd.sbl.board_output.os,
+        "get_terminal_size",
+        lambda *args: os.terminal_size((40, 24)),
+    )
+    grouped = group_collection(
+        data_config, get_collection(data_config, "collection1"), ["status"]
+    )
+    scrummd.sbl.board_output.board_grouped_output(
+        data_config,
+        OutputConfig(False, ["status"], ["index", "assignee"]),
+        scrummd.sbl.board_output.BoardConfig(),
+        grouped,
+    )
+    assert capsys.readouterr().out == (
+        "|ready         |done          >\n"
+        "|--------------|-------------->\n"
+        "|c1            |c3            >\n"
+        "|Bob           |Bob           >\n"
+        "|              |              >\n"
+        "|c2            |              >\n"
+        "|Mary          |              >\n"
+        "|              |              >\n"
+        "|e1            |              >\n"
+        "|Aleph         |              >\n"
+        "|              |              >\n"
+    )
+
+
+@pytest.mark.parametrize("output,delimiter", [("csv", ","), ("tsv", "\t")])
+def test_delimited_output(data_config, monkeypatch, capsys, output, delimiter):
+    """Test that grouped CSV and TSV have a column for each field grouped by"""
+    monkeypatch.setattr(scrummd.sbl.sbl, "load_fs_config", lambda: data_config)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["sbl", "collection1", "-o", output, "-g", "status", "-s", "index"]
+        + ["-c", "index,estimate"],
+    )
+    scrummd.sbl.sbl.entry()
+    rows = list(csv.reader(io.StringIO(capsys.readouterr().out), delimiter=delimiter))
+    assert rows == [
+        ["status", "index", "estimate"],
+        ["ready", "c1", "5"],
+        ["ready", "c2", "2.5"],
+        ["ready", "e1", "Unknown"],
+        ["done", "c3", ""],
+    ]
+
+
+def test_delimited_quoting(data_config, capsys):
+    """Test that CSV values containing commas, quotes and newlines read back as they were"""
+    card = scrummd.card.from_str(
+        data_config,
+        '---\nsummary: One, two and "three"\n---\n',
+        "",
+        Path("card.md"),
+    )
+    scrummd.sbl.csv_output.csv_stream_output(
+        data_config, OutputConfig(True, [], ["summary", "tags"]), None, [card]
+    )
+    assert list(csv.reader(io.StringIO(capsys.readouterr().out))) == [
+        ['One, two and "three"', ""]
+    ]
+
+
+def test_ndjson_output(data_config, monkeypatch, capsys):
+    """Test that NDJSON outputs an object per card, with numbers, nulls and group keys"""
+    monkeypatch.setattr(scrummd.sbl.sbl, "load_fs_config", lambda: data_config)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["sbl", "collection1", "-o", "ndjson", "-g", "status", "-s", "index"]
+        + ["-c", "index,estimate", "--limit", "2"],
+    )
+    scrummd.sbl.sbl.entry()
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"status": "ready", "index": "c1", "estimate": 5},
+        {"status": "ready", "index": "c2", "estimate": 2.5},
+    ]
@@ -1,6 +1,8 @@
+import copy
 import pytest
 from fixtures import data_config, TEST_COLLECTION_KEYS, test_collection
-from scrummd.scard import format_field, entry
+from scrummd import formatter
+from scrummd.scard import format_field, entry, output_cards
 from scrummd.source_md import Field, FieldNumber, FieldStr
 
 
@@ -24,3 +26,28 @@ def test_scard_end_to_end(card_key: str, test_collection, data_config):
     """Basic 'run with default settings on everything' integration test"""
     # No assertions, because no crash is sufficient
     entry(["scard", card_key], data_config)
+
+
+def test_output_cards_matches_format(data_config, test_collection, capsys):
+    """Test that outputting many cards is the same as formatting each of them"""
+    indexes = list(test_collection.keys())
+    output_cards(data_config, "default_scard.j2", test_collection, indexes)
+
+    expected = "".join(
+        formatter.format(data_config, "default_scard.j2", card, test_collection) + "\n"
+        for card in test_collection.values()
+    )
+    assert capsys.readouterr().out == expected
+
+
+def test_output_cards_parallel(data_config, test_collection, capsys, monkeypatch):
+    """Test that rendering in worker processes outputs the same as rendering serially"""
+    indexes = list(test_collection.keys()) + ["missing"]
+    output_cards(data_config, "default_scard.j2", test_collection, indexes)
+    serial = capsys.readouterr().out
+
+    config = copy.deepcopy(data_config)
+    config.workers = 2
+    monkeypatch.setattr(formatter, "PARALLEL_RENDER_THRESHOLD", 0)
+    output_cards(config, "default_scard.j2", test_collection, indexes)
+    assert capsys.readouterr().out == serial
@@ -0,0 +1,83 @@
+import math
+import os
+import sys
+import pytest
+from fixtures import data_config
+from scrummd.collection import get_collection
+from scrummd.exceptions import InvalidSnapshotError
+import scrummd.sexport
+from scrummd.snapshot import Snapshot, write_snapshot
+
+
+def test_snapshot_round_trip(data_config, tmp_path):
+    """Test that every field of every card reads back from a snapshot as it was"""
+    collection = get_collection(data_config)
+    write_snapshot(collection, tmp_path / "snapshot")
+
+    with Snapshot(tmp_path / "snapshot") as snapshot:
+        assert snapshot.rows == len(collection)
+        for row, card in enumerate(collection.values()):
+            for name in ["index", "summary", "path", *card.udf]:
+                assert snapshot.column(name).value(row) == card.get_field(name)
+            assert snapshot.column("not a field").value(row) is None
+
+
+def test_snapshot_aggregates(data_config, tmp_path):
+    """Test summing the numbers, and counting the strings, of a column"""
+    collection = get_collection(data_config, "collection1")
+    write_snapshot(collection, tmp_path / "snapshot")
+
+    with Snapshot(tmp_path / "snapshot") as snapshot:
+        estimate = snapshot.column("estimate")
+        assert estimate.total() == 7.5
+        assert estimate.counts() == {"Unknown": 1}
+        assert math.isnan(estimate.numbers[list(collection).index("e1")])
+        assert snapshot.column("status").counts() == {"Ready": 2, "ready": 1, "Done": 1}
+
+
+def test_snapshot_write_failure(data_config, tmp_path, monkeypatch):
+    """Test that a snapshot that fails to be written leaves nothing behind"""
+    collection = get_collection(data_config, "collection1")
+    write_snapshot(collection, tmp_path / "snapshot")
+    assert os.listdir(tmp_path) == ["snapshot"]
+
+    def failing_replace(source, destination):
+        raise OSError("Failed")
+
+    monkeypatch.setattr(os, "replace", failing_replace)
+    with pytest.raises(OSError):
+        write_snapshot(collection, tmp_path / "snapshot")
+    assert os.listdir(tmp_path) == ["snapshot"]
+
+
+@pytest.mark.parametrize("contents", [b"", b"not a snapshot", b"SMDSNAP\0\xff"])
+def test_invalid_snapshot(tmp_path, contents):
+    (tmp_path / "snapshot").write_bytes(contents)
+    with pytest.raises(InvalidSnapshotError):
+        Snapshot(tmp_path / "snapshot")
+
+
+def test_sexport(data_config, monkeypatch, tmp_path):
+    """Test that sexport writes a snapshot of the collection"""
+    monkeypatch.setattr(scrummd.sexport, "load_fs_config", lambda: data_config)
+    monkeypatch.setattr(
+        sys, "argv", ["sexport", "collection1", "-o", str(tmp_path / "snapshot")]
+    )
+    scrummd.sexport.entry()
+
+    with Snapshot(tmp_path / "snapshot") as snapshot:
+        index = snapshot.column("index")
+        values = [index.value(row) for row in range(snapshot.rows)]
+    assert values == list(get_collection(data_config, "collection1"))
+
+
+def test_sexport_refuses_scrum_path(data_config, monkeypatch, capsys):
+    """Test that sexport won't write a snapshot where it would be read as a card"""
+    monkeypatch.setattr(scrummd.sexport, "load_fs_config", lambda: data_config)
+    output = f"{data_config.scrum_path}/snapshot"
+    monkeypatch.setattr(sys, "argv", ["sexport", "-o", output])
+    with pytest.raises(SystemExit):
+        scrummd.sexport.entry()
+
+    assert "scrum folder" in capsys.readouterr().err
+    assert not os.path.exists(output)
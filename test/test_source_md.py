@@ -615,3 +615,62 @@ def test_remove_from_list_retains_original(data_config, c4_md):
     extracted = source_md.extract_fields(data_config, c4_md.read())
     extracted.remove_from_list(data_config, "tags", ["special2"])
     assert extracted["tags"] == ["special", "special2"]
+
+
+def test_modify_shares_unchanged_fields(data_config, c4_md):
+    """Test that modifying a copy leaves the original unchanged, sharing what wasn't changed"""
+    extracted = source_md.extract_fields(data_config, c4_md.read())
+    original_tags = list(extracted["tags"])
+
+    modify = extracted.add_to_list(data_config, "tags", ["new"])
+    assert modify["tags"] == original_tags + ["new"]
+    assert extracted["tags"] == original_tags
+    assert modify["summary"] is extracted["summary"]
+    assert modify.meta("summary") is extracted.meta("summary")
+
+    removed = modify.remove_from_list(data_config, "tags", ["new"])
+    assert removed["tags"] == original_tags
+    assert modify["tags"] == original_tags + ["new"]
+
+    modify = extracted.set_fields(data_config, [("status", "Ready")])
+    assert extracted["status"] == "Done"
+    assert modify["tags"] is extracted["tags"]
+
+
+LAZY_MD = """---
+summary: Lazy card
+status: Ready
+---
+
+# Description
+
+Deferred description
+
+# Tasks
+
+- one
+- two
+"""
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda parsed, config: parsed.set_fields(
+            config, [("status", "Done"), ("description", "Changed")]
+        ),
+        lambda parsed, config: parsed.add_to_list(config, "tasks", ["three"]),
+        lambda parsed, config: parsed.remove_from_list(config, "tasks", ["one"]),
+    ],
+    ids=["set_fields", "add_to_list", "remove_from_list"],
+)
+def test_change_lazy(data_config, change):
+    """Test that changing a lazy ParsedMd keeps the change, and the fields that were deferred"""
+    eager = change(source_md.extract_fields(data_config, LAZY_MD), data_config)
+    lazy = source_md.extract_fields(data_config, LAZY_MD, lazy=True)
+    assert lazy.is_lazy
+
+    changed = change(lazy, data_config)
+    changed.resolve(data_config)
+    assert dict(changed.items()) == dict(eager.items())
+    assert changed.order() == eager.order()
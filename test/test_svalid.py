@@ -1,5 +1,11 @@
 from copy import copy
-from scrummd.svalid import get_exit_code, ExitCode
+import json
+from pathlib import Path
+import shutil
+import subprocess
+import pytest
+from scrummd.exceptions import ChangeDetectionError
+from scrummd.svalid import get_exit_code, get_report, ExitCode
 from fixtures import data_config
 
 
@@ -19,3 +25,128 @@ def test_rule_violation(data_config):
     config = copy(data_config)
     config.scrum_path = "test/special_cases/rule_violation"
     assert get_exit_code(config) == ExitCode.RULE_VIOLATION
+
+
+@pytest.fixture
+def git_config(data_config, tmp_path):
+    """Config for a copy of the test data, committed to a new git repository"""
+    config = copy(data_config)
+    shutil.copytree(data_config.scrum_path, tmp_path / "data")
+    config.scrum_path = str(tmp_path / "data")
+
+    def git(*args):
+        subprocess.run(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+            + list(args),
+            cwd=tmp_path,
+            check=True,
+            capture_output=True,
+        )
+
+    git("init")
+    git("add", ".")
+    git("commit", "-m", "Cards")
+    return config
+
+
+def test_changed_since_unchanged(git_config):
+    assert get_exit_code(git_config, "HEAD") == ExitCode.SUCCESSFUL
+
+
+def test_changed_since_invalid(git_config):
+    Path(git_config.scrum_path, "new.md").write_text("# No summary")
+    assert get_exit_code(git_config, "HEAD") == ExitCode.INVALID_FILE
+
+
+def test_changed_since_rule_violation(git_config):
+    """Test that changing a card breaking the rules of its collection is found"""
+    c7_path = Path(git_config.scrum_path, "collection4", "c7.md")
+    c7_path.write_text(c7_path.read_text().replace("assignee: User\n", ""))
+    assert get_exit_code(git_config, "HEAD") == ExitCode.RULE_VIOLATION
+
+
+def test_changed_since_ignores_unchanged(git_config):
+    """Test that cards that were already invalid at the ref aren't validated"""
+    c7_path = Path(git_config.scrum_path, "collection4", "c7.md")
+    c7_path.write_text(c7_path.read_text().replace("assignee: User\n", ""))
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+        + ["commit", "-am", "Break c7"],
+        cwd=git_config.scrum_path,
+        check=True,
+        capture_output=True,
+    )
+    assert get_exit_code(git_config, "HEAD") == ExitCode.SUCCESSFUL
+    assert get_exit_code(git_config, "HEAD~1") == ExitCode.RULE_VIOLATION
+
+
+def test_changed_since_unknown_ref(git_config):
+    with pytest.raises(ChangeDetectionError):
+        get_exit_code(git_config, "no-such-ref")
+
+
+def test_changed_since_option_ref(git_config):
+    """Test that a ref that git would take as an option is refused"""
+    with pytest.raises(ChangeDetectionError):
+        get_exit_code(git_config, "--output=" + str(Path(git_config.scrum_path, "out")))
+    assert not Path(git_config.scrum_path, "out").exists()
+
+
+def test_report_successful(data_config):
+    config = copy(data_config)
+    config.scrum_path = "test/data/collection1"
+    assert get_report(config) == (
+        ExitCode.SUCCESSFUL,
+        {"exit_code": 0, "problems": []},
+    )
+
+
+def test_report_finds_every_problem(data_config, tmp_path):
+    """Test that every problem is reported, with the highest exit code"""
+    config = copy(data_config)
+    shutil.copytree(data_config.scrum_path, tmp_path / "data")
+    config.scrum_path = str(tmp_path / "data")
+    Path(config.scrum_path, "no_summary.md").write_text("# No summary")
+    Path(config.scrum_path, "c1.md").write_text("---\nsummary: Duplicate\n---\n")
+    c7_path = Path(config.scrum_path, "collection4", "c7.md")
+    c7_path.write_text(c7_path.read_text().replace("assignee: User\n", ""))
+
+    exit_code, report = get_report(config)
+
+    assert exit_code == ExitCode.RULE_VIOLATION
+    assert report["exit_code"] == ExitCode.RULE_VIOLATION.value
+    problems = {
+        (Path(problem["path"]).name, problem["error"], problem["collection"])
+        for problem in report["problems"]
+    }
+    assert problems == {
+        ("no_summary.md", "InvalidFileError", None),
+        ("c1.md", "DuplicateIndexError", None),
+        ("c7.md", "RequiredFieldNotPresentError", "collection4"),
+    }
+    json.dumps(report)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_report_unreadable_files(data_config, tmp_path, monkeypatch, workers):
+    """Test that files that can't be read are reported, rather than stopping the report"""
+    monkeypatch.setattr("scrummd.loader.PARALLEL_THRESHOLD", 0)
+    config = copy(data_config)
+    config.workers = workers
+    shutil.copytree(data_config.scrum_path, tmp_path / "data")
+    config.scrum_path = str(tmp_path / "data")
+    Path(config.scrum_path, "undecodable.md").write_bytes(
+        b"---\nsummary: \xff\xfe\n---\n"
+    )
+    Path(config.scrum_path, "dangling.md").symlink_to(tmp_path / "missing.md")
+
+    exit_code, report = get_report(config)
+
+    assert exit_code == ExitCode.INVALID_FILE
+    problems = {
+        (Path(problem["path"]).name, problem["error"]) for problem in report["problems"]
+    }
+    assert problems == {
+        ("undecodable.md", "InvalidFileError"),
+        ("dangling.md", "InvalidFileError"),
+    }